@@ -6,21 +6,146 @@ Permite búsquedas avanzadas con operadores booleanos y exportación a Markdown
 
 import streamlit as st
 import pandas as pd
-from openalex_search import OpenAlexSearcher
+from openalex_search import OpenAlexSearcher, pool_stats
+from openalex_cache import ResponseCache, ResolutionCache, PdfStore
+from openalex_jobs import DownloadJournal, DownloadManager
+from openalex_query import QueryError
+from openalex_ratelimit import get_default_rate_limiter
 from openalex_logger import OpenAlexLogger
 from datetime import datetime
-import io
-import zipfile
 import os
-import shutil
+import re
 
 # Logging anónimo de búsquedas (opcional, no rompe si falla)
 try:
-    from openalex_logger import log_search_event
+    from openalex_logger import log_search_event, anonymous_session_id
     LOGGING_AVAILABLE = True
 except ImportError:
     LOGGING_AVAILABLE = False
 
+# DOIs procesados en paralelo al descargar PDFs
+PDF_DOWNLOAD_WORKERS = 6
+# Trabajos de descarga simultáneos (de todas las sesiones) y refresco del panel
+PDF_DOWNLOAD_JOBS = 2
+DOWNLOAD_POLL_SECONDS = 2
+
+@st.cache_resource
+def get_response_cache():
+    """Caché en disco de respuestas de OpenAlex, compartida por todas las sesiones"""
+    try:
+        return ResponseCache(ttl=24 * 3600, max_bytes=200 * 1024 * 1024)
+    except Exception:
+        return None  # Sin caché si el disco no es escribible
+
+@st.cache_resource
+def get_resolution_cache():
+    """Caché en disco DOI → URL del PDF (incluye DOIs sin PDF por 24 h)"""
+    try:
+        return ResolutionCache(ttl=30 * 24 * 3600, negative_ttl=24 * 3600)
+    except Exception:
+        return None
+
+@st.cache_resource
+def get_pdf_store():
+    """Almacén local de PDFs ya descargados, compartido por todas las sesiones"""
+    try:
+        return PdfStore(max_bytes=2 * 1024 * 1024 * 1024)
+    except Exception:
+        return None
+
+@st.cache_resource
+def get_download_journal():
+    """Diario de trabajos de descarga: permite reanudar tras un rerun o reinicio"""
+    try:
+        return DownloadJournal()
+    except Exception:
+        return None
+
+@st.cache_resource
+def get_download_manager():
+    """Descargas en segundo plano, compartidas por todas las sesiones"""
+    # Se resuelven acá, en el hilo del script: la factory corre en el hilo
+    # del trabajo, sin contexto de Streamlit para st.cache_resource
+    resolution_cache = get_resolution_cache()
+    pdf_store = get_pdf_store()
+    return DownloadManager(
+        searcher_factory=lambda: OpenAlexSearcher(
+            resolution_cache=resolution_cache,
+            pdf_store=pdf_store
+        ),
+        journal=get_download_journal(),
+        max_jobs=PDF_DOWNLOAD_JOBS,
+        workers_per_job=PDF_DOWNLOAD_WORKERS
+    )
+
+def show_download_job(job_id):
+    """Panel del trabajo de descarga; mientras corre se refresca solo (st.fragment)"""
+    manager = get_download_manager()
+    status = manager.status(job_id)
+    if status is None:
+        st.session_state.pop('pdf_job_id', None)
+        return
+    running = status['state'] in ('queued', 'running')
+
+    @st.fragment(run_every=DOWNLOAD_POLL_SECONDS if running else None)
+    def _panel():
+        status = manager.status(job_id)
+        if status is None:
+            return
+        if status['state'] == 'queued':
+            st.info("⏳ Descarga en cola: empieza cuando termine alguna de las que están en curso")
+            return
+        if status['state'] == 'running':
+            total = status['total'] or 1
+            st.progress(min(status['done'] / total, 1.0))
+            st.caption(f"🔄 Procesando: {status['done']}/{status['total']} | Descargados: {status['downloaded']}")
+            return
+        if running:
+            # Terminó entre dos refrescos: rerun completo para dejar de sondear
+            st.rerun()
+
+        if status['state'] == 'error':
+            st.error(f"❌ La descarga falló: {status['error']}")
+            return
+
+        stats = status['stats'] or {}
+        if status['zip_path'] and os.path.exists(status['zip_path']):
+            st.success(f"✅ Descarga completada")
+        else:
+            st.warning("⚠️ No se pudo descargar ningún PDF")
+
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("✅ PDFs descargados", stats.get('downloaded', 0))
+        col_b.metric("❌ Sin PDF", stats.get('no_pdf', 0))
+        col_c.metric("⚠️ Errores", stats.get('failed', 0))
+        if stats.get('resolution_cache_hits'):
+            st.caption(f"♻️ {stats['resolution_cache_hits']} DOIs resueltos desde caché "
+                       f"({stats.get('resolution_cache_misses', 0)} resueltos de nuevo)")
+        if not status['complete']:
+            st.warning(f"⏸️ Quedaron {status['states'].get('failed', 0)} DOIs con fallas transitorias: "
+                       f"presiona de nuevo 'Descargar PDFs' para reintentarlos")
+
+        if status['zip_path'] and os.path.exists(status['zip_path']):
+            # Botón para descargar el ZIP
+            with open(status['zip_path'], 'rb') as zip_file:
+                st.download_button(
+                    label="📦 Descargar ZIP con PDFs",
+                    data=zip_file,
+                    file_name=status['zip_name'],
+                    mime="application/zip",
+                    help=f"Descarga {stats.get('downloaded', 0)} PDFs con nombres: ID-Autor-Titulo.pdf"
+                )
+
+            st.info(f"💡 **Tip:** Descomprime el archivo ZIP en tu dispositivo y sube los PDFs a NotebookLM")
+
+        # Mostrar errores si los hay
+        if stats.get('errors') and len(stats['errors']) > 0:
+            with st.expander(f"⚠️ Ver detalles de errores ({len(stats['errors'])} total)"):
+                for error in stats['errors'][:20]:  # Mostrar primeros 20
+                    st.text(error)
+
+    _panel()
+
 # Configuración de la página
 st.set_page_config(
     page_title="Búsqueda Académica - OpenAlex",
@@ -194,8 +319,117 @@ year_range = st.slider(
 )
 year_from, year_to = year_range
 
-# Botón de búsqueda
-search_button = st.button("🔍 Buscar", type="primary", width="stretch")
+# Botones de búsqueda y de resumen del corpus
+col_search, col_summary = st.columns([3, 1])
+with col_search:
+    search_button = st.button("🔍 Buscar", type="primary", width="stretch")
+    # Preflight: cuántos resultados hay y cuánto costaría bajarlos. Se pide
+    # solo cuando cambian la consulta o los filtros, no en cada rerun
+    if query:
+        preflight_key = (query, max_results, search_type, open_access_filter, year_from, year_to)
+        if st.session_state.get('preflight_key') != preflight_key:
+            st.session_state['preflight_key'] = preflight_key
+            try:
+                st.session_state['preflight'] = OpenAlexSearcher(cache=get_response_cache()).preflight(
+                    query,
+                    max_results=max_results,
+                    search_type=search_type,
+                    open_access_filter=open_access_filter,
+                    year_from=year_from,
+                    year_to=year_to
+                )
+            except QueryError as e:
+                st.session_state['preflight'] = {'query_error': str(e)}
+            except Exception:
+                # El preflight es orientativo; la búsqueda informa los errores
+                st.session_state['preflight'] = None
+        estimate = st.session_state.get('preflight')
+        if estimate and 'query_error' in estimate:
+            st.caption(f"⚠️ Consulta mal formada: {estimate['query_error']}")
+        elif estimate:
+            seconds = int(round(estimate['seconds']))
+            duration = f"{seconds // 60} min {seconds % 60} s" if seconds >= 60 else f"{max(seconds, 1)} s"
+            st.caption(
+                f"🔎 {estimate['count']:,} coincidencias en OpenAlex".replace(",", ".")
+                + f" · se bajarían {estimate['fetch']} en {estimate['pages']} página(s)"
+                + f" · ~{duration}"
+                + ("" if estimate['latency_measured'] else " (estimación inicial)")
+            )
+            if estimate['count'] > 10 * max_results:
+                st.caption("💡 La consulta es muy amplia: considere acotarla con AND, NOT o el rango de años")
+with col_summary:
+    summary_button = st.button(
+        "📊 Resumir corpus",
+        width="stretch",
+        help="Años, acceso abierto, revistas e instituciones de todos los resultados, sin descargarlos"
+    )
+
+if summary_button:
+    if not query:
+        st.error("⚠️ Por favor ingrese una consulta de búsqueda")
+    else:
+        with st.spinner("🔄 Resumiendo resultados en OpenAlex..."):
+            try:
+                searcher = OpenAlexSearcher(cache=get_response_cache())
+                st.session_state['summary'] = searcher.summarize(
+                    query,
+                    search_type=search_type,
+                    open_access_filter=open_access_filter,
+                    year_from=year_from,
+                    year_to=year_to
+                )
+                st.session_state['summary_query'] = query
+            except QueryError as e:
+                st.error(f"⚠️ Consulta mal formada: {e}")
+            except Exception as e:
+                st.error(f"❌ Error obteniendo el resumen: {str(e)}")
+
+# Panorama del corpus completo (group_by en OpenAlex)
+if st.session_state.get('summary'):
+    summary = st.session_state['summary']
+    with st.expander(f"📊 Panorama de «{st.session_state.get('summary_query', '')}»", expanded=True):
+        st.metric("Resultados totales en OpenAlex", f"{summary['count']:,}".replace(",", "."))
+        if summary['years']:
+            st.caption("Publicaciones por año")
+            st.bar_chart(pd.DataFrame(summary['years'], columns=['Año', 'Obras']).set_index('Año'))
+        col_oa, col_venues, col_inst = st.columns(3)
+        with col_oa:
+            st.caption("Estado de acceso abierto")
+            st.dataframe(pd.DataFrame(summary['oa_status'], columns=['Estado', 'Obras']), hide_index=True, width="stretch")
+        with col_venues:
+            st.caption("Revistas principales")
+            st.dataframe(pd.DataFrame(summary['venues'], columns=['Revista', 'Obras']), hide_index=True, width="stretch")
+        with col_inst:
+            st.caption("Instituciones principales")
+            st.dataframe(pd.DataFrame(summary['institutions'], columns=['Institución', 'Obras']), hide_index=True, width="stretch")
+
+# Alternativa: partir de una lista de DOIs (p. ej. exportada de Zotero)
+with st.expander("📋 Cargar desde lista de DOIs"):
+    dois_input = st.text_area(
+        "DOIs separados por comas, espacios o saltos de línea",
+        placeholder="10.1234/abcd, 10.5678/efgh",
+        height=120
+    )
+    dois_button = st.button("📥 Obtener metadatos", width="stretch")
+
+if dois_button:
+    doi_list = [d for d in re.split(r"[\s,;]+", dois_input or "") if d]
+    if not doi_list:
+        st.error("⚠️ Ingrese al menos un DOI")
+    else:
+        with st.spinner(f"🔄 Consultando {len(doi_list)} DOIs en OpenAlex..."):
+            try:
+                searcher = OpenAlexSearcher(cache=get_response_cache())
+                results = searcher.get_works_by_dois(doi_list, profile="table")
+                if not results:
+                    st.warning("OpenAlex no reconoce ninguno de los DOIs ingresados")
+                else:
+                    df = pd.DataFrame(results)
+                    st.session_state['results'] = df
+                    st.session_state['query'] = f"lista de {len(doi_list)} DOIs"
+                    st.success(f"✅ {len(df)} de {len(doi_list)} DOIs encontrados en OpenAlex")
+            except Exception as e:
+                st.error(f"❌ Error consultando los DOIs: {str(e)}")
 
 # Función para convertir resultados a Markdown
 def convert_to_markdown(results_df):
@@ -238,60 +472,81 @@ if search_button:
     if not query:
         st.error("⚠️ Por favor ingrese una consulta de búsqueda")
     else:
-        with st.spinner("🔄 Buscando en OpenAlex..."):
-            try:
-                # Inicializar el buscador
-                searcher = OpenAlexSearcher()
-
-                # Realizar búsqueda
-                results = searcher.get_all_results(
-                    query=query,
-                    max_results=max_results,
-                    search_type=search_type,
-                    open_access_filter=open_access_filter,
-                    year_from=year_from,
-                    year_to=year_to
+        try:
+            # Inicializar el buscador (búsquedas repetidas salen de la caché)
+            searcher = OpenAlexSearcher(cache=get_response_cache())
+
+            # Realizar búsqueda: la tabla se muestra con la primera página y
+            # se va completando mientras llegan las demás (en columnas, sin un
+            # dict por fila; ver ColumnarResults)
+            status = st.empty()
+            preview = st.empty()
+            cols = None
+            status.info("🔄 Buscando en OpenAlex...")
+            for cols in searcher.iter_results_columns(
+                query=query,
+                max_results=max_results,
+                search_type=search_type,
+                open_access_filter=open_access_filter,
+                year_from=year_from,
+                year_to=year_to,
+                # El CSV automático y el registro llevan los abstracts: se
+                # piden en la misma búsqueda (sin requests adicionales)
+                profile="abstracts",
+                parallel_pages=True,
+                sort_by=sort_by
+            ):
+                status.info(f"🔄 Recibidos {len(cols)} resultados (máximo {max_results})...")
+                preview.dataframe(
+                    cols.to_frame(['title', 'author', 'publication', 'year', 'citations']),
+                    width="stretch",
+                    height=400
                 )
+            preview.empty()
+            df = cols.to_frame() if cols is not None else pd.DataFrame()
 
-                if not results:
-                    st.warning("No se encontraron resultados para esta búsqueda")
-                else:
-                    # Convertir a DataFrame
-                    df = pd.DataFrame(results)
-
-                    # Guardar CSV automáticamente en el directorio
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    csv_filename = f"resultados_{timestamp}.csv"
-                    df.to_csv(csv_filename, index=False, encoding='utf-8')
-
-                    # Guardar en session state
-                    st.session_state['results'] = df
-                    st.session_state['query'] = query
-                    st.session_state['csv_filename'] = csv_filename
-
-                    # Logging anónimo (no bloquea si falla)
-                    if LOGGING_AVAILABLE:
-                        try:
-                            log_search_event(
-                                query=query,
-                                search_params={
-                                    'search_type': search_type,
-                                    'max_results': max_results,
-                                    'open_access_filter': open_access_filter,
-                                    'year_from': year_from,
-                                    'year_to': year_to,
-                                    'sort_by': sort_by
-                                },
-                                results_df=df
-                            )
-                        except Exception:
-                            pass  # Silencioso
-
-                    st.success(f"✅ Se encontraron {len(df)} resultados")
-                    st.info(f"📁 CSV guardado automáticamente: {csv_filename}")
-
-            except Exception as e:
-                st.error(f"❌ Error durante la búsqueda: {str(e)}")
+            if df.empty:
+                status.empty()
+                st.warning("No se encontraron resultados para esta búsqueda")
+            else:
+                status.empty()
+
+                # Guardar CSV automáticamente en el directorio
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                csv_filename = f"resultados_{timestamp}.csv"
+                df.to_csv(csv_filename, index=False, encoding='utf-8')
+
+                # Guardar en session state
+                st.session_state['results'] = df
+                st.session_state['query'] = query
+                st.session_state['csv_filename'] = csv_filename
+
+                # Logging anónimo (no bloquea si falla)
+                if LOGGING_AVAILABLE:
+                    try:
+                        log_search_event(
+                            query=query,
+                            search_params={
+                                'search_type': search_type,
+                                'max_results': max_results,
+                                'open_access_filter': open_access_filter,
+                                'year_from': year_from,
+                                'year_to': year_to,
+                                'sort_by': sort_by
+                            },
+                            results_df=df
+                        )
+                    except Exception:
+                        pass  # Silencioso
+
+                st.success(f"✅ Se encontraron {len(df)} resultados")
+                st.info(f"📁 CSV guardado automáticamente: {csv_filename}")
+
+        except QueryError as e:
+            status.empty()
+            st.error(f"⚠️ Consulta mal formada: {e}")
+        except Exception as e:
+            st.error(f"❌ Error durante la búsqueda: {str(e)}")
 
 # Mostrar resultados
 if 'results' in st.session_state and st.session_state['results'] is not None:
@@ -302,7 +557,11 @@ if 'results' in st.session_state and st.session_state['results'] is not None:
     # Estadísticas
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total de resultados", len(df))
-    col2.metric("Con abstract", df['abstract'].notna().sum())
+    if df['abstract'].isna().any():
+        # Búsqueda sin abstracts: se cargan al abrir cada resultado
+        col2.metric("Con abstract", "—", help="Los abstracts se cargan al abrir el detalle de cada resultado")
+    else:
+        col2.metric("Con abstract", int((df['abstract'] != '').sum()))
     col3.metric("Acceso abierto", df['open_access'].sum())
     col4.metric("Promedio de citas", int(df['citations'].astype(float).mean()))
 
@@ -358,108 +617,38 @@ if 'results' in st.session_state and st.session_state['results'] is not None:
 
                 unique_dois = list(metadata.keys())
 
-                st.info(f"ℹ️ Se procesarán {len(unique_dois)} DOIs únicos")
-                with st.spinner(f"🔄 Descargando PDFs..."):
-                    # Crear directorio de PDFs
-                    pdf_dir = f"pdfs_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-                    # Crear barra de progreso
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-
-                    # Definir callback de progreso
-                    def update_progress(current, total, downloaded):
-                        progress = current / total
-                        progress_bar.progress(progress)
-                        status_text.text(f"Procesando: {current}/{total} | Descargados: {downloaded}")
-
-                    # Inicializar buscador y descargar con metadatos
-                    searcher = OpenAlexSearcher()
-                    stats = searcher.download_pdfs_from_dois(
-                        unique_dois,
-                        output_dir=pdf_dir,
-                        progress_callback=update_progress,
-                        metadata=metadata
-                    )
-
-                    # Limpiar elementos de progreso
-                    progress_bar.empty()
-                    status_text.empty()
-
-                    # Crear archivo ZIP con todos los PDFs descargados
-                    if stats['downloaded'] > 0:
-                        status_text.text("📦 Empaquetando PDFs en archivo ZIP...")
-
-                        # Crear ZIP en memoria
-                        zip_buffer = io.BytesIO()
-                        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                            # Agregar todos los PDFs al ZIP
-                            for pdf_file in os.listdir(pdf_dir):
-                                if pdf_file.endswith('.pdf'):
-                                    pdf_path = os.path.join(pdf_dir, pdf_file)
-                                    # Agregar al ZIP con el mismo nombre
-                                    zip_file.write(pdf_path, pdf_file)
-
-                        # Guardar ZIP en session state
-                        zip_buffer.seek(0)
-                        st.session_state['pdf_zip'] = zip_buffer.getvalue()
-                        st.session_state['pdf_zip_name'] = f"pdfs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-                        st.session_state['pdf_stats'] = stats
-
-                        # Logging de descarga de PDFs (no bloquea si falla)
-                        if LOGGING_AVAILABLE and 'results' in st.session_state:
-                            try:
-                                log_search_event(
-                                    query=st.session_state.get('query', 'N/A'),
-                                    search_params={
-                                        'search_type': 'pdf_download',
-                                        'max_results': len(unique_dois),
-                                        'open_access_filter': 'N/A',
-                                        'year_from': '',
-                                        'year_to': '',
-                                        'sort_by': 'N/A'
-                                    },
-                                    results_df=st.session_state['results'],
-                                    pdf_stats=stats
-                                )
-                            except Exception:
-                                pass  # Silencioso
-
-                        # Limpiar directorio temporal de PDFs
-                        try:
-                            shutil.rmtree(pdf_dir)
-                        except Exception:
-                            pass  # No es crítico si falla la limpieza
-
-                        status_text.empty()
-
-                # Mostrar resultados si hay un ZIP disponible
-                if 'pdf_zip' in st.session_state:
-                    stats = st.session_state.get('pdf_stats', {})
-
-                    st.success(f"✅ Descarga completada")
-
-                    col_a, col_b, col_c = st.columns(3)
-                    col_a.metric("✅ PDFs descargados", stats.get('downloaded', 0))
-                    col_b.metric("❌ Sin PDF", stats.get('no_pdf', 0))
-                    col_c.metric("⚠️ Errores", stats.get('failed', 0))
-
-                    # Botón para descargar el ZIP
-                    st.download_button(
-                        label="📦 Descargar ZIP con PDFs",
-                        data=st.session_state['pdf_zip'],
-                        file_name=st.session_state['pdf_zip_name'],
-                        mime="application/zip",
-                        help=f"Descarga {stats.get('downloaded', 0)} PDFs con nombres: ID-Autor-Titulo.pdf"
+                # Datos para el log de la descarga: el trabajo termina en otro
+                # thread, donde no hay acceso a st.session_state
+                log_query = st.session_state.get('query', 'N/A')
+                log_results = st.session_state.get('results')
+                log_session = anonymous_session_id() if LOGGING_AVAILABLE else None
+
+                def log_download(stats):
+                    if not LOGGING_AVAILABLE or log_results is None or stats['downloaded'] == 0:
+                        return
+                    log_search_event(
+                        query=log_query,
+                        search_params={
+                            'search_type': 'pdf_download',
+                            'max_results': len(unique_dois),
+                            'open_access_filter': 'N/A',
+                            'year_from': '',
+                            'year_to': '',
+                            'sort_by': 'N/A'
+                        },
+                        results_df=log_results,
+                        pdf_stats=stats,
+                        session_id=log_session
                     )
 
-                    st.info(f"💡 **Tip:** Descomprime el archivo ZIP en tu dispositivo y sube los PDFs a NotebookLM")
+                # La descarga corre en segundo plano (ver DownloadManager): la
+                # página sigue respondiendo y un rerun no la interrumpe
+                rows = df_with_doi.drop_duplicates('doi').to_dict('records')
+                st.session_state['pdf_job_id'] = get_download_manager().submit(rows, metadata=metadata, on_done=log_download)
+                st.info(f"ℹ️ Se procesarán {len(unique_dois)} DOIs únicos en segundo plano")
 
-                    # Mostrar errores si los hay
-                    if stats.get('errors') and len(stats['errors']) > 0:
-                        with st.expander(f"⚠️ Ver detalles de errores ({len(stats['errors'])} total)"):
-                            for error in stats['errors'][:20]:  # Mostrar primeros 20
-                                st.text(error)
+        if st.session_state.get('pdf_job_id'):
+            show_download_job(st.session_state['pdf_job_id'])
 
     # Tabla de resultados
     st.subheader("📋 Vista de Resultados")
@@ -499,6 +688,16 @@ if 'results' in st.session_state and st.session_state['results'] is not None:
     if selected_index is not None:
         selected = df.iloc[selected_index]
 
+        # Cargar el abstract solo para la fila abierta (si la búsqueda no lo trajo)
+        abstract = selected['abstract']
+        if pd.isna(abstract):
+            try:
+                searcher = OpenAlexSearcher(cache=get_response_cache())
+                abstract = searcher.fetch_abstracts([selected['openalex_id']]).get(selected['openalex_id'], "")
+                st.session_state['results'].at[selected.name, 'abstract'] = abstract
+            except Exception:
+                abstract = ""
+
         with st.expander("📄 Detalle Completo", expanded=True):
             st.markdown(f"### {selected['title']}")
             st.markdown(f"**Autores:** {selected['author']}")
@@ -510,7 +709,38 @@ if 'results' in st.session_state and st.session_state['results'] is not None:
             st.markdown(f"**Acceso Abierto:** {'Sí' if selected['open_access'] else 'No'}")
 
             st.markdown("#### Abstract")
-            st.write(selected['abstract'] if selected['abstract'] else "No disponible")
+            st.write(abstract if abstract else "No disponible")
+
+# Presupuesto de la API (compartido por todas las sesiones; se muestra al
+# final para que incluya los requests de esta ejecución)
+with st.sidebar:
+    st.divider()
+    api_status = get_default_rate_limiter().status()
+    st.metric(
+        "Requests a OpenAlex disponibles hoy",
+        f"{api_status['remaining']:,}".replace(",", "."),
+        help=f"Presupuesto diario compartido: {api_status['daily_budget']:,} requests; se renueva a medianoche UTC".replace(",", ".")
+    )
+    if api_status['cooldown'] > 0:
+        st.caption(f"⏳ OpenAlex pidió bajar el ritmo: pausa de {api_status['cooldown']:.0f} s en curso")
+    elif api_status['throttled']:
+        st.caption(f"⚠️ {api_status['throttled']} request(s) frenados por OpenAlex y reintentados")
+
+    # Conexiones HTTP del proceso (pool compartido por todas las Sessions)
+    connections = pool_stats()
+    if connections:
+        with st.expander("🔌 Conexiones HTTP"):
+            total_requests = sum(c['requests'] for c in connections.values())
+            total_reused = sum(c['reused'] for c in connections.values())
+            st.caption(f"{total_reused} de {total_requests} requests reutilizaron una conexión abierta")
+            st.dataframe(
+                pd.DataFrame(
+                    [(host, c['requests'], c['new_connections'], c['reused']) for host, c in connections.items()],
+                    columns=['Dominio', 'Requests', 'Conexiones nuevas', 'Reutilizadas']
+                ).sort_values('Requests', ascending=False),
+                hide_index=True,
+                width="stretch"
+            )
 
 # Footer
 st.divider()
@@ -0,0 +1,106 @@
+# bench_columnar.py — compara la construcción de resultados fila-a-fila vs por columnas
+"""
+Benchmark sin red del armado de resultados de get_all_results
+
+Camino actual:   json.loads por página → _extract_row (dict por fila) → pd.DataFrame(rows)
+Camino columnar: _loads (orjson si está) por página → ColumnarResults → DataFrame
+
+Uso:
+    python bench_columnar.py [cantidad_de_obras] [repeticiones]
+"""
+
+import sys
+import json
+import time
+import random
+
+import pandas as pd
+
+from openalex_search import OpenAlexSearcher, ColumnarResults, JSON_DECODER, _loads
+
+WORDS = (
+    "historia política argentina peronismo movimiento obrero sindicatos estado "
+    "economía sociedad cultura memoria democracia partido elecciones trabajo"
+).split()
+
+
+def _fake_work(i, rnd):
+    abstract_len = rnd.randint(80, 300)
+    inverted = {}
+    for pos in range(abstract_len):
+        inverted.setdefault(rnd.choice(WORDS) + str(rnd.randint(0, 50)), []).append(pos)
+    return {
+        "id": f"https://openalex.org/W{i}",
+        "doi": f"https://doi.org/10.{1000 + i % 50}/abc.{i}",
+        "display_name": f"Trabajo {i}: " + " ".join(rnd.choices(WORDS, k=8)),
+        "publication_year": 1950 + i % 75,
+        "cited_by_count": rnd.randint(0, 500),
+        "open_access": {"is_oa": bool(i % 2), "oa_status": "gold"},
+        "authorships": [
+            {"author": {"display_name": f"Autor{i}_{k} Apellido{k}"}} for k in range(rnd.randint(1, 6))
+        ],
+        "primary_location": {
+            "source": {"display_name": f"Revista {i % 30}"},
+            "landing_page_url": f"https://revista.example/{i}",
+            "pdf_url": None,
+        },
+        "best_oa_location": {"pdf_url": f"https://revista.example/{i}.pdf", "landing_page_url": None},
+        "abstract_inverted_index": inverted,
+    }
+
+
+def _pages(n, per_page=200, seed=42):
+    rnd = random.Random(seed)
+    works = [_fake_work(i, rnd) for i in range(n)]
+    return [
+        json.dumps({"meta": {"count": n}, "results": works[i:i + per_page]}).encode("utf-8")
+        for i in range(0, n, per_page)
+    ]
+
+
+def row_path(searcher, pages, query):
+    out = []
+    for raw in pages:
+        out.extend(json.loads(raw)["results"])
+    return pd.DataFrame(searcher._finalize_rows(out, query))
+
+
+def columnar_path(searcher, pages, query):
+    cols = ColumnarResults(searcher, query)
+    for raw in pages:
+        cols.append_works(_loads(raw)["results"])
+    return cols.to_frame()
+
+
+def _best(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    searcher = OpenAlexSearcher()
+    pages = _pages(n)
+    size_mb = sum(len(p) for p in pages) / 1e6
+    query = "peronismo"
+
+    t_rows, df_rows = _best(lambda: row_path(searcher, pages, query), repeat)
+    t_cols, df_cols = _best(lambda: columnar_path(searcher, pages, query), repeat)
+
+    pd.testing.assert_frame_equal(df_rows, df_cols)
+
+    print(f"obras: {n} | páginas: {len(pages)} | JSON: {size_mb:.1f} MB | mejor de {repeat}")
+    print(f"{'fila a fila (json + dicts):':34}{t_rows * 1000:8.1f} ms")
+    print(f"{'columnar (' + JSON_DECODER + ' + columnas):':34}{t_cols * 1000:8.1f} ms")
+    print(f"aceleración: {t_rows / t_cols:.2f}x  (DataFrames idénticos)")
+
+
+if __name__ == "__main__":
+    main()
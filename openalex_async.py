@@ -0,0 +1,853 @@
+# openalex_async.py — motor asyncio para OpenAlexSearcher (búsqueda + descarga)
+"""
+Variante asíncrona de OpenAlexSearcher
+
+Usa httpx.AsyncClient para mantener cientos de requests (landing pages,
+sondeos de PDF) en vuelo sobre un único event loop. Reutiliza de
+OpenAlexSearcher toda la lógica sin red: parámetros de búsqueda, extracción
+de filas, heurísticas de HTML y nombres de archivo.
+
+Uso:
+    searcher = AsyncOpenAlexSearcher()
+    rows = await searcher.get_all_results("peronismo", max_results=200)
+
+    # API sincrónica de siempre sobre el motor asyncio
+    rows = SyncOpenAlexSearcher().get_all_results("peronismo")
+"""
+
+import os
+import time
+import asyncio
+import threading
+import importlib.util
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode
+
+# Importaciones opcionales (no rompen si faltan)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# HTTP/2 multiplexa muchos requests en una conexión (httpx lo usa si está h2)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+from openalex_search import (
+    OPENALEX_BASE,
+    HOST_MAX_CONCURRENCY,
+    HOST_RATE,
+    HOST_BURST,
+    HOST_OVERRIDES,
+    PAGE_WINDOW,
+    PAGE_FETCH_WORKERS,
+    DOI_CHUNK_SIZE,
+    SUMMARY_GROUPS,
+    HEDGE_STAGGER,
+    HEDGE_MAX_PARALLEL,
+    HEDGE_GRACE,
+    HEDGE_START_POLL,
+    ColumnarResults,
+    HostScheduler,
+    OpenAlexSearcher,
+    _DEFAULT_HEADERS,
+    _safe_progress,
+    _sanitize_doi_for_filename,
+    _interleave_by_prefix,
+    _new_download_stats,
+    _record_download_outcome,
+    _is_definitive_miss,
+    _no_pdf_entry,
+    _loads,
+    _page_latency,
+    _probe_step,
+    _race_step,
+)
+from openalex_ratelimit import API_MAX_ATTEMPTS, OpenAlexRateLimitError
+from openalex_resolvers import doi_candidates, landing_candidates
+
+# Requests simultáneos como máximo en todo el event loop
+MAX_IN_FLIGHT = 200
+
+
+def run_sync(coro):
+    """
+    Ejecuta una corrutina y devuelve su resultado desde código sincrónico
+
+    Si ya hay un event loop corriendo en este hilo (p. ej. Jupyter), la
+    corrutina se ejecuta en un hilo aparte con su propio loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def _runner():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    t = threading.Thread(target=_runner, daemon=True)
+    t.start()
+    t.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+class _AsyncTokenBucket:
+    """Versión asyncio de _TokenBucket (un bucket por dominio)"""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        while True:
+            async with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+class _AsyncHostScheduler:
+    """Límites por dominio (mismos valores que HostScheduler) + tope global en vuelo"""
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, max_concurrency=HOST_MAX_CONCURRENCY, rate=HOST_RATE, burst=HOST_BURST, overrides=None):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.overrides = dict(HOST_OVERRIDES if overrides is None else overrides)
+        self._global = asyncio.Semaphore(max_in_flight)
+        self._hosts = {}
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            conc, rate, burst = self.overrides.get(host, (self.max_concurrency, self.rate, self.burst))
+            state = (asyncio.Semaphore(conc), _AsyncTokenBucket(rate, burst))
+            self._hosts[host] = state
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url, consume_token=True):
+        # Primero el dominio: las tareas en cola de un dominio saturado no
+        # ocupan lugares del tope global
+        sem, bucket = self._state(HostScheduler.host_of(url))
+        async with sem:
+            async with self._global:
+                if consume_token:
+                    await bucket.acquire()
+                yield
+
+
+class _OpenPdf:
+    """Respuesta PDF abierta cuyo primer bloque ya se leyó para validar la firma"""
+
+    def __init__(self, response, first, rest):
+        self.response = response
+        self.headers = response.headers
+        self.first = first
+        self.rest = rest
+
+    async def aiter_bytes(self):
+        if self.first:
+            yield self.first
+        async for chunk in self.rest:
+            yield chunk
+
+    async def aclose(self):
+        await self.response.aclose()
+
+
+class AsyncOpenAlexSearcher(OpenAlexSearcher):
+    """
+    OpenAlexSearcher con red asíncrona
+
+    Todos los métodos que tocan la red son corrutinas (`iter_results`, un
+    generador asíncrono) y devuelven exactamente lo mismo que en la versión
+    sincrónica: get_all_results, get_all_results_frame, preflight,
+    summarize, get_works_by_dois, fetch_abstracts y download_pdfs_*.
+
+    SQLite (cachés, diario), el almacén de PDFs y el ZIP bloquean: se llaman
+    en el executor del loop (ver _io), nunca sobre el event loop.
+    """
+
+    def __init__(self, timeout=25, mailto=None, max_in_flight=MAX_IN_FLIGHT, cache=None, resolution_cache=None, pdf_store=None, rate_limiter=None, scheduler=None, session=None):
+        """
+        Args como OpenAlexSearcher, salvo:
+            max_in_flight: Tope global de requests en vuelo
+            scheduler: _AsyncHostScheduler a compartir entre llamadas (por
+                       defecto, uno nuevo por llamada)
+            session: httpx.AsyncClient a usar (por defecto, uno nuevo por
+                     llamada); el caller lo cierra. Como el scheduler, sirve
+                     para un único event loop
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("AsyncOpenAlexSearcher requiere httpx (pip install httpx)")
+        super().__init__(timeout=timeout, mailto=mailto, cache=cache, resolution_cache=resolution_cache, pdf_store=pdf_store, rate_limiter=rate_limiter, session=session)
+        self.scheduler = scheduler
+        self.max_in_flight = max_in_flight
+
+    def _new_session(self):
+        # Sin requests.Session: el cliente httpx se crea por llamada (_client_scope)
+        return None
+
+    @asynccontextmanager
+    async def _client_scope(self):
+        """Cliente HTTP y scheduler válidos para un único event loop"""
+        scheduler = self.scheduler or _AsyncHostScheduler(max_in_flight=self.max_in_flight)
+        if self.session is not None:
+            yield self.session, scheduler
+            return
+        limits = httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=min(self.max_in_flight, 100))
+        async with httpx.AsyncClient(
+            headers=dict(_DEFAULT_HEADERS),
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=limits,
+            http2=HTTP2_AVAILABLE,
+        ) as client:
+            yield client, scheduler
+
+    async def _io(self, fn, *args):
+        # Disco y SQLite bloquean: se ejecutan fuera del event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fn, *args)
+
+    # ------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------
+    async def _request(self, client, params):
+        p = {k: v for k, v in params.items() if v not in (None, "")}
+        cached = await self._io(self._cached_response, p)
+        if cached is not None:
+            return cached
+        key_params = dict(p)
+        if self.mailto:
+            p["mailto"] = self.mailto
+        url = f"{OPENALEX_BASE}?{urlencode(p, doseq=True)}"
+
+        limiter = self.rate_limiter
+        r = None
+        for attempt in range(API_MAX_ATTEMPTS):
+            delay = limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            t0 = time.monotonic()
+            try:
+                r = await client.get(url)
+            except httpx.TransportError:
+                if attempt == API_MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(limiter.backoff(attempt))
+                continue
+            limiter.update_from_headers(r.headers)
+            if r.status_code == 200:
+                data = _loads(r.content)
+                if int(p.get("per_page", 0)) > 1 and "group_by" not in p:
+                    _page_latency.record(time.monotonic() - t0)
+                if self.cache is not None:
+                    await self._io(self.cache.put, key_params, data)
+                return data
+            if r.status_code in (403, 429):
+                limiter.backoff(attempt, r.headers.get("Retry-After"), throttled=True)
+                continue
+            if r.status_code >= 500:
+                await asyncio.sleep(limiter.backoff(attempt, r.headers.get("Retry-After")))
+                continue
+            r.raise_for_status()
+        if r.status_code in (403, 429):
+            raise OpenAlexRateLimitError(
+                f"OpenAlex sigue limitando los requests (HTTP {r.status_code}) "
+                f"después de {API_MAX_ATTEMPTS} intentos; pruebe de nuevo en unos minutos"
+            )
+        r.raise_for_status()
+
+    async def _fetch_numbered_pages(self, client, params, first_page, last_page):
+        base = {k: v for k, v in params.items() if k != "cursor"}
+        sem = asyncio.Semaphore(PAGE_FETCH_WORKERS)
+
+        async def _fetch(page):
+            async with sem:
+                data = await self._request(client, dict(base, page=page))
+            return data.get("results", []) or []
+
+        # gather conserva el orden de las páginas
+        return await asyncio.gather(*(_fetch(p) for p in range(first_page, last_page + 1)))
+
+    async def _iter_work_pages(self, client, params, max_results, parallel_pages=False):
+        """Igual que OpenAlexSearcher._iter_work_pages (generador asíncrono)"""
+        params = dict(params, cursor="*")
+        if parallel_pages:
+            data = await self._request(client, params)
+            first = (data.get("results", []) or [])[:max_results]
+            if first:
+                yield first
+            meta = data.get("meta", {})
+            total = min(meta.get("count") or 0, max_results)
+            if not first or len(first) >= total:
+                return
+            if total <= PAGE_WINDOW:
+                remaining = total - len(first)
+                for batch in await self._fetch_numbered_pages(client, params, 2, -(-total // params["per_page"])):
+                    batch = batch[:remaining]
+                    if not batch:
+                        break
+                    yield batch
+                    remaining -= len(batch)
+                return
+            # Fuera de la ventana numerada: seguir con el cursor
+            fetched = len(first)
+            cur = meta.get("next_cursor")
+            if not cur:
+                return
+            params["cursor"] = cur
+        else:
+            fetched = 0
+        while fetched < max_results:
+            data = await self._request(client, params)
+            batch = (data.get("results", []) or [])[:max_results - fetched]
+            if batch:
+                yield batch
+            fetched += len(batch)
+            cur = data.get("meta", {}).get("next_cursor")
+            if not cur or not batch:
+                break
+            params["cursor"] = cur
+
+    async def get_all_results(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        out = []
+        async for rows in self.iter_results(query, max_results, search_type, open_access_filter, year_from, year_to, profile, parallel_pages, sort_by):
+            out.extend(rows)
+        return out
+
+    async def iter_results(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        """Generador asíncrono: filas página por página (ver OpenAlexSearcher.iter_results)"""
+        params = self._build_search_params(query, max_results, search_type, open_access_filter, year_from, year_to, profile, sort_by)
+        async with self._client_scope() as (client, _):
+            async for batch in self._iter_work_pages(client, params, max_results, parallel_pages):
+                yield self._finalize_rows(batch, query)
+
+    async def get_all_results_frame(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        cols = ColumnarResults(self, query)
+        async for cols in self.iter_results_columns(query, max_results, search_type, open_access_filter, year_from, year_to, profile, parallel_pages, sort_by):
+            pass
+        return cols.to_frame()
+
+    async def iter_results_columns(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        """Generador asíncrono: ver OpenAlexSearcher.iter_results_columns"""
+        params = self._build_search_params(query, max_results, search_type, open_access_filter, year_from, year_to, profile, sort_by)
+        cols = ColumnarResults(self, query)
+        async with self._client_scope() as (client, _):
+            async for batch in self._iter_work_pages(client, params, max_results, parallel_pages):
+                cols.append_works(batch)
+                yield cols
+
+    async def preflight(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, parallel_pages=True):
+        params, per_page = self._preflight_params(query, max_results, search_type, open_access_filter, year_from, year_to)
+        data = await self._io(self._cached_response, params)
+        elapsed = None
+        if data is None:
+            async with self._client_scope() as (client, _):
+                t0 = time.monotonic()
+                data = await self._request(client, params)
+                elapsed = time.monotonic() - t0
+        return self._preflight_estimate(data, elapsed, per_page, max_results, parallel_pages)
+
+    async def summarize(self, query, search_type="general", open_access_filter="all", year_from=None, year_to=None, top_n=10, max_workers=4):
+        params = self._summary_params(query, search_type, open_access_filter, year_from, year_to)
+        sem = asyncio.Semaphore(max(1, max_workers))
+        async with self._client_scope() as (client, _):
+
+            async def _fetch(field):
+                async with sem:
+                    return await self._request(client, dict(params, group_by=field))
+
+            responses = await asyncio.gather(*(_fetch(field) for field in SUMMARY_GROUPS.values()))
+        return self._summary_from(dict(zip(SUMMARY_GROUPS, responses)), top_n)
+
+    async def get_works_by_dois(self, dois, chunk_size=DOI_CHUNK_SIZE, max_workers=4, profile="full"):
+        wanted, chunks = self._doi_chunks(dois, chunk_size)
+        sem = asyncio.Semaphore(max(1, max_workers))
+        async with self._client_scope() as (client, _):
+
+            async def _fetch(chunk):
+                async with sem:
+                    data = await self._request(client, self._doi_chunk_params(chunk, profile))
+                return data.get("results", []) or []
+
+            batches = await asyncio.gather(*(_fetch(chunk) for chunk in chunks))
+        return self._rows_by_doi(wanted, batches)
+
+    async def fetch_abstracts(self, openalex_ids, chunk_size=DOI_CHUNK_SIZE, max_workers=4):
+        short, chunks = self._abstract_chunks(openalex_ids, chunk_size)
+        sem = asyncio.Semaphore(max(1, max_workers))
+        async with self._client_scope() as (client, _):
+
+            async def _fetch(params):
+                async with sem:
+                    return await self._request(client, params)
+
+            responses = await asyncio.gather(*(_fetch(params) for params in chunks))
+        return self._abstracts_from(short, responses)
+
+    # ------------------------------------------------------------------
+    # Descarga
+    # ------------------------------------------------------------------
+    async def _send(self, client, scheduler, url, headers=None, on_start=None):
+        """
+        GET en streaming con los límites del dominio de cada salto
+
+        Como HostScheduler.request: las redirecciones se siguen a mano y cada
+        salto reserva su lugar en su propio dominio; `on_start` se llama una
+        vez, al conseguir el lugar del primer salto.
+        """
+        request = client.build_request("GET", url, headers=headers)
+        history = []
+        for _ in range(client.max_redirects + 1):
+            async with scheduler.slot(str(request.url)):
+                if on_start is not None:
+                    on_start()
+                    on_start = None
+                r = await client.send(request, stream=True, follow_redirects=False)
+            if r.next_request is None:
+                r.history = history
+                return r
+            await r.aclose()
+            history.append(r)
+            request = r.next_request
+        raise httpx.TooManyRedirects(f"Más de {client.max_redirects} redirecciones", request=request)
+
+    async def _get(self, client, scheduler, url, headers=None):
+        r = await self._send(client, scheduler, url, headers=headers)
+        try:
+            await r.aread()
+        finally:
+            await r.aclose()
+        return r
+
+    async def _open(self, client, scheduler, url, headers=None):
+        # Respuesta en streaming: el cuerpo se lee (aread) solo si hace falta
+        return await self._send(client, scheduler, url, headers=headers)
+
+    async def _parse(self, fn, *args):
+        # El parseo de HTML es CPU: se hace fuera del event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fn, *args)
+
+    async def _try_get_pdf(self, client, scheduler, url, referer=None, on_start=None):
+        """
+        GET en streaming: confirma PDF (Content-Type o firma %PDF) leyendo solo
+        el primer bloque y deja la respuesta abierta para escribirla
+
+        Returns:
+            (ok, final_url, pdf, detail) — si ok, `pdf` es un _OpenPdf que el
+            caller debe cerrar; `detail` como en OpenAlexSearcher._try_get_pdf
+        """
+        headers = {
+            "User-Agent": _DEFAULT_HEADERS["User-Agent"],
+            "Accept": "application/pdf,application/octet-stream;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.8",
+        }
+        if referer:
+            headers["Referer"] = referer
+
+        r = None
+        try:
+            r = await self._send(client, scheduler, url, headers=headers, on_start=on_start)
+            detail = {"status": r.status_code}
+            if not r.is_success:
+                await r.aclose()
+                return False, None, None, detail
+            chunks = r.aiter_bytes()
+            first = b""
+            async for chunk in chunks:
+                first = chunk
+                break
+            ct = (r.headers.get("content-type") or "").lower()
+            if "application/pdf" in ct or first.startswith(b"%PDF"):
+                return True, str(r.url), _OpenPdf(r, first, chunks), detail
+            await r.aclose()
+            return False, None, None, detail
+        except asyncio.CancelledError:
+            # Sondeo descartado por una carrera ya decidida
+            if r is not None:
+                await r.aclose()
+            raise
+        except Exception as e:
+            if r is not None:
+                await r.aclose()
+            return False, None, None, {"error": str(e) or type(e).__name__}
+
+    async def _race_candidates(self, client, scheduler, candidates, log, stage):
+        """
+        Igual que OpenAlexSearcher._race_candidates, con tareas asyncio: los
+        sondeos que pierden la carrera se cancelan de verdad (y liberan su
+        lugar en el dominio antes de que se descargue el ganador)
+
+        Returns:
+            (candidato, final_url, pdf) del ganador, o (None, None, None)
+        """
+        if not candidates:
+            return None, None, None
+        n = len(candidates)
+        results = [None] * n
+        pending = {}
+        starts = [None] * n
+        launched = 0
+        head = 0
+        winner = None
+        grace_start = None
+        t0 = time.monotonic()
+
+        def _started(i):
+            return lambda: starts.__setitem__(i, time.monotonic())
+
+        try:
+            while head < n:
+                now = time.monotonic()
+                can_launch = launched < n and len(pending) < HEDGE_MAX_PARALLEL and grace_start is None
+                last_start = starts[launched - 1] if launched else None
+                if can_launch and (not pending or (last_start is not None and now - last_start >= HEDGE_STAGGER)):
+                    c = candidates[launched]
+                    task = asyncio.ensure_future(self._try_get_pdf(client, scheduler, c["url"], referer=c["referer"], on_start=_started(launched)))
+                    pending[task] = launched
+                    launched += 1
+                    continue
+                timeouts = []
+                if can_launch:
+                    timeouts.append(HEDGE_START_POLL if last_start is None else HEDGE_STAGGER - (now - last_start))
+                if grace_start is not None:
+                    timeouts.append(HEDGE_GRACE - (now - grace_start))
+                timeout = max(0.0, min(timeouts)) if timeouts else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i = pending.pop(task)
+                    try:
+                        results[i] = task.result()
+                    except Exception as e:
+                        results[i] = (False, None, None, {"error": str(e) or type(e).__name__})
+                    ok, fin, _, detail = results[i]
+                    if starts[i] is None:
+                        starts[i] = time.monotonic()  # falló antes de conseguir lugar
+                    started = starts[i] - t0
+                    log["steps"].append(_probe_step(candidates[i], ok, fin, detail, stage, started, time.monotonic() - t0 - started))
+                while head < n and results[head] is not None and not results[head][0]:
+                    head += 1
+                if head < n and results[head] is not None:
+                    winner = head
+                    break
+                best = next((i for i in range(head + 1, n) if results[i] is not None and results[i][0]), None)
+                if best is not None:
+                    # Ya respondió uno de menor prioridad: los anteriores tienen HEDGE_GRACE s más
+                    if grace_start is None:
+                        grace_start = time.monotonic()
+                    elif time.monotonic() - grace_start >= HEDGE_GRACE:
+                        winner = best
+                        break
+        finally:
+            cancelled = [candidates[i]["url"] for i in pending.values()]
+            for task in pending:
+                task.cancel()
+            # Los que terminaron justo antes de cancelarse pueden traer una respuesta abierta
+            for res in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(res, tuple) and res[0]:
+                    await res[2].aclose()
+            for i, res in enumerate(results):
+                if res is not None and res[0] and i != winner:
+                    await res[2].aclose()
+            log["steps"].append(_race_step(stage, candidates, launched, winner, cancelled))
+
+        if winner is None:
+            return None, None, None
+        return candidates[winner], results[winner][1], results[winner][2]
+
+    async def _resolve_pdf_with_logs(self, client, scheduler, doi, debug=True, debug_dir="debug_openalex", pdf_urls=None):
+        """
+        Mismo pipeline que la versión sincrónica (locations → plugins →
+        landing → meta → enlaces directos → view), pero devuelve además la respuesta PDF ya abierta
+
+        Returns:
+            (pdf_url, method, referer, log, pdf)
+        """
+        log = {"doi": doi, "steps": []}
+        doi_norm = (doi or "").replace("https://doi.org/", "").replace("http://doi.org/", "").strip()
+        doi_safe = _sanitize_doi_for_filename(doi)
+        none = (None, None, None, log, None)
+
+        def _log(step):
+            log["steps"].append(step)
+
+        # Primero los PDFs de las locations de OpenAlex, en carrera escalonada
+        tried = set()
+        if pdf_urls:
+            candidates = self._location_candidates(pdf_urls, log, tried)
+            cand, fin, pdf = await self._race_candidates(client, scheduler, candidates, log, "location")
+            if cand:
+                return fin, cand["method"], cand["referer"], log, pdf
+
+        # Estrategia 0a: plugins por prefijo de DOI, sin pasar por doi.org
+        matches = doi_candidates(doi_norm)
+        if matches:
+            candidates = self._plugin_candidates(matches, None, log, tried)
+            cand, fin, pdf = await self._race_candidates(client, scheduler, candidates, log, "plugin")
+            self._record_plugins(matches, cand, log)
+            if cand:
+                return fin, cand["method"], cand["referer"], log, pdf
+
+        try:
+            landing = await self._open(client, scheduler, f"https://doi.org/{doi_norm}")
+            _log({"phase": "landing", "request": f"https://doi.org/{doi_norm}", "status": landing.status_code, "final_url": str(landing.url)})
+        except Exception as e:
+            _log({"phase": "landing", "error": str(e)})
+            return none
+
+        if not landing.is_success:
+            await landing.aclose()
+            return none
+        base = str(landing.url)
+
+        # Detectar si Crossref redirect a su API (devuelve JSON en lugar de HTML)
+        if "api.crossref.org" in base.lower():
+            _log({"phase": "crossref_api_detected", "url": base})
+            try:
+                await landing.aread()
+                primary_url = landing.json().get("resource", {}).get("primary", {}).get("URL")
+                if primary_url:
+                    _log({"phase": "crossref_primary_url", "url": primary_url})
+                    try:
+                        landing = await self._open(client, scheduler, primary_url)
+                        base = str(landing.url)
+                        _log({"phase": "article_page", "status": landing.status_code, "url": base})
+                        if not landing.is_success:
+                            await landing.aclose()
+                            return none
+                    except Exception as e:
+                        _log({"phase": "article_page_error", "error": str(e)})
+                        return none
+            except Exception as e:
+                _log({"phase": "crossref_json_parse_error", "error": str(e)})
+
+        # Estrategia 0b: plugins por host de la landing (OJS, SciELO, Redalyc, PMC...)
+        matches = landing_candidates(base)
+        if matches:
+            candidates = self._plugin_candidates(matches, base, log, tried)
+            cand, fin, pdf = await self._race_candidates(client, scheduler, candidates, log, "plugin")
+            self._record_plugins(matches, cand, log)
+            if cand:
+                await landing.aclose()
+                return fin, cand["method"], cand["referer"], log, pdf
+
+        try:
+            await landing.aread()
+        except Exception as e:
+            _log({"phase": "landing_read", "error": str(e)})
+            return none
+
+        if debug and debug_dir:
+            try:
+                with open(os.path.join(debug_dir, f"{doi_safe}_landing.html"), "wb") as fh:
+                    fh.write(landing.content)
+            except Exception as e:
+                _log({"phase": "debug_save_landing", "error": str(e)})
+
+        # Un único análisis de la landing alimenta las tres estrategias
+        page = await self._parse(self._analyze_landing, landing.content, base)
+
+        # Estrategias 1 y 2: meta tags PDF y enlaces directos, en carrera escalonada
+        candidates = [c for c in self._landing_candidates(page, base, log) if c["url"] not in tried]
+        cand, fin, pdf = await self._race_candidates(client, scheduler, candidates, log, "landing")
+        if cand:
+            return fin, cand["method"], cand["referer"], log, pdf
+
+        # Estrategia 3: pipeline view → download
+        view_url = page["view_url"]
+        _log({"phase": "view_lookup", "view_url": view_url or ""})
+        if view_url:
+            try:
+                view = await self._get(client, scheduler, view_url, headers={"Referer": base})
+                _log({"phase": "view_request", "status": view.status_code, "final_url": str(view.url)})
+            except Exception as e:
+                _log({"phase": "view_request", "error": str(e)})
+                return none
+
+            if view.is_success:
+                view_final = str(view.url)
+                if debug and debug_dir:
+                    try:
+                        with open(os.path.join(debug_dir, f"{doi_safe}_view.html"), "wb") as fh:
+                            fh.write(view.content)
+                    except Exception as e:
+                        _log({"phase": "debug_save_view", "error": str(e)})
+                dlinks = await self._parse(self._extract_download_links_from_view, view.content, view_final)
+                _log({"phase": "download_links", "count": len(dlinks), "links": dlinks})
+                candidates = [
+                    {"url": durl, "method": "view_download", "referer": view_final, "phase": "download_try"}
+                    for durl in dlinks
+                ]
+                cand, fin, pdf = await self._race_candidates(client, scheduler, candidates, log, "view")
+                if cand:
+                    return fin, "view_download", view_final, log, pdf
+
+        return none
+
+    async def _resolve_cached(self, client, scheduler, doi, debug=True, debug_dir="debug_openalex", pdf_urls=None):
+        """
+        Igual que OpenAlexSearcher._resolve_cached, pero con la respuesta PDF abierta
+
+        Returns:
+            (pdf_url, method, referer, flow_log, pdf, cache_state)
+        """
+        rc = self.resolution_cache
+        if rc is not None:
+            hit = await self._io(rc.get, doi)
+            if hit is not None:
+                log = {"doi": doi, "steps": [{"phase": "resolution_cache", "pdf_url": hit["pdf_url"] or "", "method": hit["method"] or ""}]}
+                if not hit["pdf_url"]:
+                    cand, fin, pdf = None, None, None
+                    if pdf_urls:
+                        candidates = self._location_candidates(pdf_urls, log, set())
+                        cand, fin, pdf = await self._race_candidates(client, scheduler, candidates, log, "location")
+                    if not cand:
+                        return None, None, None, log, None, "hit"
+                    await self._io(rc.put, doi, fin, cand["method"], cand["referer"])
+                    return fin, cand["method"], cand["referer"], log, pdf, "miss"
+                ok, fin, pdf, _ = await self._try_get_pdf(client, scheduler, hit["pdf_url"], referer=hit["referer"])
+                if ok:
+                    return fin, hit["method"], hit["referer"], log, pdf, "hit"
+                # La URL cacheada dejó de servir: resolver de nuevo
+                await self._io(rc.delete, doi)
+
+        pdf_url, method, referer, flow_log, pdf = await self._resolve_pdf_with_logs(client, scheduler, doi, debug=debug, debug_dir=debug_dir, pdf_urls=pdf_urls)
+        if rc is None:
+            return pdf_url, method, referer, flow_log, pdf, None
+        if pdf_url:
+            await self._io(rc.put, doi, pdf_url, method, referer)
+        elif _is_definitive_miss(flow_log):
+            await self._io(rc.put_negative, doi)
+        return pdf_url, method, referer, flow_log, pdf, "miss"
+
+    async def _download_one(self, client, scheduler, idx, doi, output_dir, debug=True, debug_dir="debug_openalex", metadata=None, archive=None, pdf_urls=None, job=None):
+        errors = []
+        stored = await self._io(self._from_store, idx, doi, output_dir, metadata, errors)
+        if stored:
+            if archive is not None:
+                await self._io(archive.add_file, stored["file_path"], os.path.basename(stored["file_path"]))
+            return stored, errors
+
+        pdf_url, method, referer, flow_log, pdf, cache_state = await self._resolve_cached(client, scheduler, doi, debug=debug, debug_dir=debug_dir, pdf_urls=pdf_urls)
+        await self._io(self._save_flow_log, doi, flow_log, debug, debug_dir, errors)
+
+        def _entry(**fields):
+            entry = {"doi": doi, **fields}
+            if cache_state:
+                entry["resolution_cache"] = cache_state
+            return entry
+
+        if not pdf_url:
+            return _no_pdf_entry(_entry, flow_log, cache_state), errors
+        if job is not None:
+            await self._io(job.mark_resolved, doi, pdf_url, method)
+
+        try:
+            name = self._output_filename(idx, doi, metadata, pdf)
+            fpath = os.path.join(output_dir, name)
+            async with scheduler.slot(pdf_url, consume_token=False):
+                with open(fpath, "wb") as f:
+                    async for chunk in pdf.aiter_bytes():
+                        if chunk:
+                            f.write(chunk)
+            if archive is not None:
+                # Relectura deliberada del archivo recién escrito (ver PdfArchive)
+                await self._io(archive.add_file, fpath, name)
+            await self._io(self._to_store, doi, fpath, errors)
+            return _entry(status="downloaded", url=pdf_url, method=method, file_path=fpath), errors
+        except Exception as e:
+            errors.append(f"{doi}: {e}")
+            return _entry(status="error", error=str(e)), errors
+        finally:
+            await pdf.aclose()
+
+    async def download_pdfs_from_dois(self, dois, output_dir, progress_callback=None, debug=True, debug_dir="debug_openalex", metadata=None, max_workers=50, archive=None, pdf_urls=None, job=None):
+        """
+        Descarga PDFs desde una lista de DOIs (corrutina)
+
+        Mismos argumentos y mismo diccionario de estadísticas que
+        OpenAlexSearcher.download_pdfs_from_dois; `max_workers` es la cantidad
+        de DOIs resolviéndose a la vez sobre el event loop.
+        download_pdfs_from_rows (heredado) devuelve también una corrutina.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        pdf_urls = pdf_urls or {}
+        if debug and debug_dir:
+            os.makedirs(debug_dir, exist_ok=True)
+
+        stats = _new_download_stats(len(dois))
+        jobs = list(enumerate(dois, start=1))
+        if job is not None:
+            jobs, pdf_urls = await self._io(self._replay_job, job, jobs, pdf_urls, stats, archive)
+        jobs = _interleave_by_prefix(jobs)
+
+        async with self._client_scope() as (client, scheduler):
+            limit = asyncio.Semaphore(max(1, max_workers))
+
+            async def _run(idx, doi):
+                async with limit:
+                    try:
+                        return await self._download_one(client, scheduler, idx, doi, output_dir, debug, debug_dir, metadata, archive, pdf_urls.get(doi), job)
+                    except Exception as e:
+                        return {"doi": doi, "status": "error", "error": str(e)}, [f"{doi}: {e}"]
+
+            done = len(dois) - len(jobs)
+            for fut in asyncio.as_completed([_run(idx, doi) for idx, doi in jobs]):
+                entry, errors = await fut
+                _record_download_outcome(stats, entry, errors)
+                if job is not None:
+                    await self._io(job.record, entry)
+                done += 1
+                _safe_progress(progress_callback, done, len(dois), stats['downloaded'])
+
+        return stats
+
+
+class SyncOpenAlexSearcher:
+    """API sincrónica de OpenAlexSearcher ejecutada sobre el motor asyncio"""
+
+    def __init__(self, *args, **kwargs):
+        self.engine = AsyncOpenAlexSearcher(*args, **kwargs)
+
+    def get_all_results(self, *args, **kwargs):
+        return run_sync(self.engine.get_all_results(*args, **kwargs))
+
+    def get_all_results_frame(self, *args, **kwargs):
+        return run_sync(self.engine.get_all_results_frame(*args, **kwargs))
+
+    def preflight(self, *args, **kwargs):
+        return run_sync(self.engine.preflight(*args, **kwargs))
+
+    def summarize(self, *args, **kwargs):
+        return run_sync(self.engine.summarize(*args, **kwargs))
+
+    def get_works_by_dois(self, *args, **kwargs):
+        return run_sync(self.engine.get_works_by_dois(*args, **kwargs))
+
+    def fetch_abstracts(self, *args, **kwargs):
+        return run_sync(self.engine.fetch_abstracts(*args, **kwargs))
+
+    def download_pdfs_from_dois(self, *args, **kwargs):
+        return run_sync(self.engine.download_pdfs_from_dois(*args, **kwargs))
+
+    def download_pdfs_from_rows(self, *args, **kwargs):
+        return run_sync(self.engine.download_pdfs_from_rows(*args, **kwargs))
@@ -0,0 +1,370 @@
+# openalex_cache.py — cachés locales persistentes (SQLite) para OpenAlexSearcher
+"""
+Cachés en disco compartidas entre sesiones del taller
+
+ResponseCache: respuestas de la API de OpenAlex (/works), indexadas por el
+conjunto normalizado de parámetros (sin `mailto`), con TTL y expulsión por
+tamaño (las entradas usadas hace más tiempo se borran primero).
+
+ResolutionCache: DOI → (pdf_url, method, referer) ya resueltos, incluidos
+los resultados negativos ("no_pdf") con una expiración más corta.
+
+PdfStore: almacén de PDFs direccionado por contenido (SHA-256), indexado por
+DOI, con tope de tamaño y expulsión LRU. Las descargas nuevas se copian
+desde aquí en lugar de volver a bajar el archivo.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+CACHE_DIR = os.getenv("OPENALEX_CACHE_DIR", ".openalex_cache")
+
+# Parámetros que no cambian la respuesta y no forman parte de la clave
+_IGNORED_PARAMS = {"mailto"}
+
+
+def _normalize_doi(doi):
+    return (doi or "").replace("https://doi.org/", "").replace("http://doi.org/", "").strip().lower()
+
+
+def _copy_hashing(src_path, dest_path):
+    """Copia `src_path` en `dest_path` en una sola lectura; devuelve el SHA-256"""
+    h = hashlib.sha256()
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            h.update(chunk)
+            dest.write(chunk)
+    return h.hexdigest()
+
+
+def _cache_key(params):
+    """Clave estable: parámetros sin vacíos ni `mailto`, ordenados, como JSON"""
+    norm = {
+        str(k): str(v)
+        for k, v in params.items()
+        if k not in _IGNORED_PARAMS and v not in (None, "")
+    }
+    raw = json.dumps(norm, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _SQLiteStore:
+    """Base común: una conexión por operación, serializadas con un lock"""
+
+    SCHEMA = ""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+class ResponseCache(_SQLiteStore):
+    """
+    Caché de respuestas JSON de OpenAlex
+
+    Es opcional: un error de SQLite (disco lleno, archivo bloqueado o
+    dañado) cuenta como miss en `get` y se ignora en `put`, así la búsqueda
+    sigue por la red. `errors` acumula cuántos hubo.
+
+    Args:
+        path: Archivo SQLite
+        ttl: Segundos de validez de cada respuesta
+        max_bytes: Tamaño total máximo; al superarlo se expulsan las entradas
+                   con acceso más antiguo
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+    """
+
+    def __init__(self, path=None, ttl=24 * 3600, max_bytes=200 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        super().__init__(path or os.path.join(CACHE_DIR, "responses.sqlite"))
+
+    def get(self, params):
+        """Devuelve la respuesta guardada para `params` o None si no hay / expiró"""
+        key = _cache_key(params)
+        now = time.time()
+        with self._lock:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute("SELECT body, created FROM responses WHERE key = ?", (key,)).fetchone()
+                    if row is None or now - row[1] > self.ttl:
+                        if row is not None:
+                            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        row = None
+                    else:
+                        conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                data = json.loads(row[0]) if row is not None else None
+            except (sqlite3.Error, ValueError):
+                self.errors += 1
+                data = None
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, params, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        now = time.time()
+        with self._lock:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, body, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                        (_cache_key(params), body, len(body), now, now),
+                    )
+                    self._evict(conn)
+            except sqlite3.Error:
+                self.errors += 1
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+class ResolutionCache(_SQLiteStore):
+    """
+    Caché persistente DOI → URL del PDF
+
+    Como ResponseCache es opcional: un error de SQLite cuenta como miss en
+    `get` y se ignora al escribir o borrar; `errors` acumula cuántos hubo.
+
+    Args:
+        path: Archivo SQLite
+        ttl: Segundos de validez de una resolución positiva
+        negative_ttl: Segundos de validez de un "no_pdf" (más corto: el
+                      repositorio puede publicar el PDF más adelante)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS resolutions (
+            doi TEXT PRIMARY KEY,
+            pdf_url TEXT,
+            method TEXT,
+            referer TEXT,
+            expires REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path=None, ttl=30 * 24 * 3600, negative_ttl=24 * 3600):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.errors = 0
+        super().__init__(path or os.path.join(CACHE_DIR, "resolutions.sqlite"))
+
+    def get(self, doi):
+        """
+        Returns:
+            None si no hay entrada vigente; si no, {"pdf_url", "method", "referer"}
+            (pdf_url None = resultado negativo cacheado)
+        """
+        with self._lock:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT pdf_url, method, referer, expires FROM resolutions WHERE doi = ?",
+                        (_normalize_doi(doi),),
+                    ).fetchone()
+            except sqlite3.Error:
+                self.errors += 1
+                return None
+        if row is None or row[3] < time.time():
+            return None
+        return {"pdf_url": row[0], "method": row[1], "referer": row[2]}
+
+    def _write(self, sql, args):
+        with self._lock:
+            try:
+                with self._connect() as conn:
+                    conn.execute(sql, args)
+            except sqlite3.Error:
+                self.errors += 1
+
+    def _put(self, doi, pdf_url, method, referer, ttl):
+        self._write(
+            "INSERT OR REPLACE INTO resolutions (doi, pdf_url, method, referer, expires) VALUES (?, ?, ?, ?, ?)",
+            (_normalize_doi(doi), pdf_url, method, referer, time.time() + ttl),
+        )
+
+    def put(self, doi, pdf_url, method, referer):
+        self._put(doi, pdf_url, method, referer, self.ttl)
+
+    def put_negative(self, doi):
+        self._put(doi, None, None, None, self.negative_ttl)
+
+    def delete(self, doi):
+        self._write("DELETE FROM resolutions WHERE doi = ?", (_normalize_doi(doi),))
+
+    def purge_expired(self):
+        self._write("DELETE FROM resolutions WHERE expires < ?", (time.time(),))
+
+
+class PdfStore(_SQLiteStore):
+    """
+    Almacén local de PDFs compartido entre sesiones
+
+    Cada PDF se guarda una sola vez como `<dir>/<sha[:2]>/<sha>.pdf`; la
+    tabla `entries` asocia DOIs a su SHA-256. Entrada y salida son copias,
+    nunca hard links: reescribir un archivo descargado no puede alterar el
+    almacén, y materialize() verifica el SHA-256 al copiar.
+
+    Args:
+        directory: Carpeta del almacén
+        max_bytes: Tamaño total máximo; al superarlo se borran los PDFs con
+                   acceso más antiguo
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS blobs (
+            sha256 TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            accessed REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            doi TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS blobs_accessed ON blobs (accessed);
+    """
+
+    def __init__(self, directory=None, max_bytes=2 * 1024 * 1024 * 1024):
+        self.directory = directory or os.path.join(CACHE_DIR, "pdfs")
+        self.max_bytes = max_bytes
+        super().__init__(os.path.join(self.directory, "index.sqlite"))
+
+    def _blob_path(self, sha):
+        return os.path.join(self.directory, sha[:2], f"{sha}.pdf")
+
+    def lookup(self, doi):
+        """Ruta del PDF guardado para `doi`, o None"""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT sha256 FROM entries WHERE doi = ?", (_normalize_doi(doi),)).fetchone()
+            if row is None:
+                return None
+            path = self._blob_path(row[0])
+            if not os.path.exists(path):
+                # El archivo desapareció (limpieza manual): olvidar la entrada
+                self._forget(conn, row[0])
+                return None
+            conn.execute("UPDATE blobs SET accessed = ? WHERE sha256 = ?", (time.time(), row[0]))
+        return path
+
+    def _forget(self, conn, sha):
+        conn.execute("DELETE FROM entries WHERE sha256 = ?", (sha,))
+        conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+
+    def materialize(self, doi, dest_path):
+        """
+        Crea `dest_path` (copia) desde el almacén. True si existía
+
+        Si el contenido ya no coincide con su SHA-256 el PDF se descarta del
+        almacén y se devuelve False (hay que bajarlo de nuevo).
+        """
+        src = self.lookup(doi)
+        if src is None:
+            return False
+        sha = os.path.basename(src)[:-len(".pdf")]
+        tmp = f"{dest_path}.{threading.get_ident()}.tmp"
+        try:
+            if _copy_hashing(src, tmp) == sha:
+                os.replace(tmp, dest_path)
+                return True
+        except FileNotFoundError:
+            pass  # Expulsado entre lookup() y la copia
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        with self._lock, self._connect() as conn:
+            self._forget(conn, sha)
+        try:
+            os.remove(src)
+        except OSError:
+            pass
+        return False
+
+    def put(self, doi, src_path):
+        """Agrega al almacén (copia) el PDF descargado en `src_path`; devuelve su SHA-256 (None si excede max_bytes)"""
+        size = os.path.getsize(src_path)
+        if size > self.max_bytes:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = os.path.join(self.directory, f"incoming.{threading.get_ident()}.tmp")
+        try:
+            sha = _copy_hashing(src_path, tmp)
+            dest = self._blob_path(sha)
+            if not os.path.exists(dest):
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                os.replace(tmp, dest)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO blobs (sha256, size, accessed) VALUES (?, ?, ?)",
+                (sha, size, time.time()),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (doi, sha256) VALUES (?, ?)",
+                (_normalize_doi(doi), sha),
+            )
+            self._evict(conn)
+        return sha
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for sha, size in conn.execute("SELECT sha256, size FROM blobs ORDER BY accessed").fetchall():
+            conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+            conn.execute("DELETE FROM entries WHERE sha256 = ?", (sha,))
+            try:
+                os.remove(self._blob_path(sha))
+            except OSError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
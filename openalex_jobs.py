@@ -0,0 +1,442 @@
+# openalex_jobs.py — diario persistente (SQLite) de trabajos de descarga
+"""
+Trabajos de descarga reanudables
+
+Una descarga de cientos de DOIs puede cortarse por un rerun de Streamlit, un
+refresh del navegador o un reinicio del contenedor. DownloadJournal anota en
+SQLite el estado de cada DOI del trabajo
+
+    pending → resolved → downloaded
+                       → no_pdf     (definitivo: la landing no tiene PDF)
+                       → failed     (transitorio: red, timeout, 5xx...)
+
+junto con la URL resuelta y la ruta del archivo. Al reanudar el mismo
+trabajo (mismo conjunto de DOIs → mismo job_id) se saltean los DOIs
+terminados y solo se reintentan los pendientes y las fallas transitorias,
+hasta JOB_MAX_ATTEMPTS intentos por DOI.
+
+Uso:
+    journal = DownloadJournal()
+    job = journal.open_job(dois)
+    searcher.download_pdfs_from_dois(dois, job.output_dir, job=job)
+
+DownloadManager corre esos trabajos en threads propios, fuera de la corrida
+del script de Streamlit: submit() devuelve un job_id al instante y la
+interfaz consulta status() (progreso, estadísticas parciales y el ZIP final).
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from openalex_cache import CACHE_DIR, _SQLiteStore, _normalize_doi
+from openalex_search import PdfArchive
+
+JOB_MAX_ATTEMPTS = 3          # intentos por DOI antes de darlo por fallido
+MANAGER_MAX_JOBS = 2          # trabajos de descarga simultáneos por proceso
+MANAGER_JOB_WORKERS = 6       # DOIs en paralelo dentro de cada trabajo
+FINISHED_RETENTION = 3600     # segundos que se conserva un trabajo terminado (y su ZIP)
+JOB_MAX_AGE = 7 * 24 * 3600   # segundos sin novedades tras los que un trabajo se da por abandonado
+
+STATES = ("pending", "resolved", "downloaded", "no_pdf", "failed")
+
+
+def job_id_for(dois):
+    """Identificador estable de un trabajo: depende solo del conjunto de DOIs"""
+    norm = sorted({_normalize_doi(d) for d in dois if d})
+    return hashlib.sha256("\n".join(norm).encode("utf-8")).hexdigest()[:16]
+
+
+class DownloadJournal(_SQLiteStore):
+    """
+    Diario de trabajos de descarga
+
+    Args:
+        path: Archivo SQLite
+        max_attempts: Intentos por DOI ante fallas transitorias
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            output_dir TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            created REAL NOT NULL,
+            updated REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS items (
+            job_id TEXT NOT NULL,
+            doi TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            pdf_url TEXT,
+            method TEXT,
+            file_path TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated REAL NOT NULL,
+            PRIMARY KEY (job_id, doi)
+        );
+    """
+
+    def __init__(self, path=None, max_attempts=JOB_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        super().__init__(path or os.path.join(CACHE_DIR, "jobs.sqlite"))
+
+    def open_job(self, dois, output_dir=None, job_id=None):
+        """
+        Crea el trabajo o retoma el existente con el mismo job_id
+
+        Args:
+            dois: Lista de DOIs (los nuevos se agregan como pending)
+            output_dir: Carpeta de los PDFs; por defecto una por trabajo dentro
+                        de CACHE_DIR, para que sobreviva a la sesión
+            job_id: Identificador explícito (por defecto, job_id_for(dois))
+
+        Returns:
+            DownloadJob
+        """
+        job_id = job_id or job_id_for(dois)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT output_dir FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is not None:
+                output_dir = row[0]
+            else:
+                output_dir = output_dir or os.path.join(CACHE_DIR, "jobs", job_id)
+                conn.execute(
+                    "INSERT INTO jobs (job_id, output_dir, total, created, updated) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, output_dir, len(dois), now, now),
+                )
+            conn.executemany(
+                "INSERT OR IGNORE INTO items (job_id, doi, idx, state, updated) VALUES (?, ?, ?, 'pending', ?)",
+                [(job_id, _normalize_doi(d), i, now) for i, d in enumerate(dois, start=1) if d],
+            )
+        return DownloadJob(self, job_id, output_dir)
+
+    def jobs(self):
+        """Resumen de los trabajos guardados, del más reciente al más viejo"""
+        with self._lock, self._connect() as conn:
+            jobs = conn.execute("SELECT job_id, output_dir, total, created, updated FROM jobs ORDER BY updated DESC").fetchall()
+            counts = conn.execute("SELECT job_id, state, COUNT(*) FROM items GROUP BY job_id, state").fetchall()
+        by_job = {}
+        for job_id, state, n in counts:
+            by_job.setdefault(job_id, {})[state] = n
+        return [
+            {"job_id": j, "output_dir": d, "total": t, "created": c, "updated": u, "states": by_job.get(j, {})}
+            for j, d, t, c, u in jobs
+        ]
+
+    def purge(self, max_age=JOB_MAX_AGE, keep=()):
+        """
+        Borra los trabajos abandonados: sin novedades hace más de `max_age`
+        segundos. A diferencia de delete_job, también borra su carpeta.
+
+        Args:
+            max_age: Antigüedad máxima (segundos desde la última actualización)
+            keep: job_ids que no se tocan aunque sean viejos (p. ej. en curso)
+
+        Returns:
+            Lista de job_ids borrados
+        """
+        cutoff = time.time() - max_age
+        with self._lock, self._connect() as conn:
+            old = conn.execute("SELECT job_id, output_dir FROM jobs WHERE updated < ?", (cutoff,)).fetchall()
+            old = [(job_id, output_dir) for job_id, output_dir in old if job_id not in keep]
+            conn.executemany("DELETE FROM items WHERE job_id = ?", [(job_id,) for job_id, _ in old])
+            conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id, _ in old])
+        for _, output_dir in old:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        return [job_id for job_id, _ in old]
+
+    def delete_job(self, job_id):
+        """Borra el trabajo del diario (no toca los archivos)"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM items WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def _items(self, job_id):
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT doi, idx, state, pdf_url, method, file_path, error, attempts FROM items WHERE job_id = ?",
+                (job_id,),
+            ).fetchall()
+        keys = ("doi", "idx", "state", "pdf_url", "method", "file_path", "error", "attempts")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def _update(self, job_id, doi, attempt=False, **fields):
+        now = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        if attempt:
+            assignments += ", attempts = attempts + 1"
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"UPDATE items SET {assignments}, updated = ? WHERE job_id = ? AND doi = ?",
+                (*fields.values(), now, job_id, _normalize_doi(doi)),
+            )
+            conn.execute("UPDATE jobs SET updated = ? WHERE job_id = ?", (now, job_id))
+
+
+class DownloadJob:
+    """
+    Un trabajo del diario: lo reciben download_pdfs_from_dois / _download_one
+
+    No se crea directamente: ver DownloadJournal.open_job.
+    """
+
+    def __init__(self, journal, job_id, output_dir):
+        self.journal = journal
+        self.job_id = job_id
+        self.output_dir = output_dir
+
+    def replay(self):
+        """
+        Estado guardado para reanudar
+
+        Returns:
+            (finished, known_urls): `finished` es {doi: entrada de log} de los
+            DOIs que no hay que volver a procesar (descargados cuyo archivo
+            sigue en disco, sin PDF definitivo o sin más reintentos);
+            `known_urls` es {doi: pdf_url} de los ya resueltos que quedaron a
+            medias, para probar esa URL antes que nada
+        """
+        finished, known_urls = {}, {}
+        for item in self.journal._items(self.job_id):
+            doi, state = item["doi"], item["state"]
+            if state == "downloaded" and item["file_path"] and os.path.exists(item["file_path"]):
+                finished[doi] = {
+                    "doi": doi, "status": "downloaded", "url": item["pdf_url"], "method": item["method"],
+                    "file_path": item["file_path"], "journal": "hit",
+                }
+            elif state == "no_pdf":
+                finished[doi] = {"doi": doi, "status": "no_pdf", "journal": "hit"}
+            elif state == "failed" and item["attempts"] >= self.journal.max_attempts:
+                finished[doi] = {"doi": doi, "status": "error", "error": item["error"] or "", "journal": "hit"}
+            elif item["pdf_url"]:
+                known_urls[doi] = item["pdf_url"]
+        return finished, known_urls
+
+    def mark_resolved(self, doi, pdf_url, method):
+        self.journal._update(self.job_id, doi, state="resolved", pdf_url=pdf_url, method=method)
+
+    def record(self, entry):
+        """Anota el resultado final de un DOI (una entrada de stats["log"])"""
+        if entry.get("journal") == "hit":
+            return
+        doi = entry["doi"]
+        status = entry.get("status")
+        if status == "downloaded":
+            self.journal._update(
+                self.job_id, doi, attempt=True, state="downloaded",
+                pdf_url=entry.get("url"), method=entry.get("method"), file_path=entry.get("file_path"), error=None,
+            )
+        elif status == "no_pdf" and not entry.get("transient"):
+            self.journal._update(self.job_id, doi, attempt=True, state="no_pdf", error=None)
+        else:
+            error = entry.get("error") or "sin PDF por una falla transitoria"
+            self.journal._update(self.job_id, doi, attempt=True, state="failed", error=error)
+
+    def summary(self):
+        """{estado: cantidad} del trabajo"""
+        counts = dict.fromkeys(STATES, 0)
+        for item in self.journal._items(self.job_id):
+            counts[item["state"]] = counts.get(item["state"], 0) + 1
+        return counts
+
+    def is_complete(self):
+        """True si ningún DOI queda pendiente ni con reintentos disponibles"""
+        finished, _ = self.replay()
+        return len(finished) == len(self.journal._items(self.job_id))
+
+
+def _with_locations(searcher, rows, dois):
+    """
+    Completa `pdf_urls` con todas las `locations` de OpenAlex (perfil
+    "download", un request cada 50 DOIs); la tabla de la app no las trae
+    """
+    try:
+        located = {r["doi"]: r["pdf_urls"] for r in searcher.get_works_by_dois(dois, profile="download")}
+    except Exception:
+        return rows
+    return [dict(row, pdf_urls=located[row["doi"]]) if row.get("doi") in located else row for row in rows]
+
+
+def _notify(callbacks, stats):
+    """Llama a cada on_done(stats); una falla no impide las demás"""
+    for on_done in callbacks:
+        try:
+            on_done(stats)
+        except Exception:
+            pass
+
+
+class DownloadManager:
+    """
+    Trabajos de descarga en segundo plano, compartidos por todas las sesiones
+
+    Cada trabajo corre en un thread del pool (a lo sumo `max_jobs` a la vez;
+    el resto queda en cola) y usa el diario para poder reanudarse. El
+    job_id es el de DownloadJournal: si dos usuarios piden los mismos DOIs
+    mientras el trabajo está en curso, comparten el mismo.
+
+    Args:
+        searcher_factory: Función sin argumentos que devuelve el OpenAlexSearcher
+                          a usar en cada trabajo
+        journal: DownloadJournal opcional (sin él no hay reanudación)
+        max_jobs: Trabajos simultáneos
+        workers_per_job: max_workers de download_pdfs_from_rows
+        zip_dir: Carpeta de los ZIP terminados (por defecto, la temporal)
+    """
+
+    def __init__(self, searcher_factory, journal=None, max_jobs=MANAGER_MAX_JOBS, workers_per_job=MANAGER_JOB_WORKERS, zip_dir=None):
+        self.searcher_factory = searcher_factory
+        self.journal = journal
+        self.workers_per_job = workers_per_job
+        self.zip_dir = zip_dir or tempfile.gettempdir()
+        self.pool = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="download-job")
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def submit(self, rows, metadata=None, on_done=None):
+        """
+        Encola la descarga de las filas (ver download_pdfs_from_rows)
+
+        Si ya hay un trabajo con los mismos DOIs en cola, en curso o
+        terminado sin pendientes, se devuelve ese en lugar de crear otro.
+        De paso se purgan del diario los trabajos abandonados (ver
+        DownloadJournal.purge).
+
+        Args:
+            rows: Filas de resultados con DOI
+            metadata: {doi: {'title', 'author', 'index'}} para nombrar archivos
+            on_done: Función opcional on_done(stats), llamada desde el thread
+                     del trabajo al terminar (no debe tocar st.session_state).
+                     Si el trabajo ya existía se suma a las de los pedidos
+                     anteriores; si ya había terminado se llama enseguida
+
+        Returns:
+            job_id
+        """
+        rows = [dict(row) for row in rows if isinstance(row.get("doi"), str) and row.get("doi")]
+        dois = list(dict.fromkeys(row["doi"] for row in rows))
+        job_id = job_id_for(dois)
+        with self._lock:
+            self._prune()
+            task = self._tasks.get(job_id)
+            reuse = task is not None and (task["state"] in ("queued", "running") or (task["state"] == "done" and task["complete"]))
+            if reuse and task["state"] != "done":
+                if on_done is not None:
+                    task["_on_done"].append(on_done)
+                return job_id
+            if not reuse:
+                self._tasks[job_id] = {
+                    "job_id": job_id, "state": "queued", "total": len(dois), "done": 0, "downloaded": 0,
+                    "states": {}, "stats": None, "zip_path": None, "zip_name": None, "complete": False,
+                    "error": None, "submitted": time.time(), "started": None, "finished": None, "_job": None,
+                    "_on_done": [on_done] if on_done is not None else [],
+                }
+        if reuse:
+            # Ya terminado: este pedido recibe las estadísticas de la corrida existente
+            _notify([on_done] if on_done is not None else [], task["stats"])
+            return job_id
+        self.pool.submit(self._run, job_id, rows, dois, metadata)
+        if self.journal is not None:
+            try:
+                self.journal.purge(keep=set(self.active()))
+            except Exception:
+                pass  # La limpieza no debe impedir la descarga
+        return job_id
+
+    def status(self, job_id):
+        """
+        Foto del trabajo para la interfaz, o None si no existe (o ya se descartó)
+
+        Claves: state ("queued", "running", "done", "error"), total, done,
+        downloaded, states (conteo por estado del diario), stats (al
+        terminar), zip_path, zip_name, complete, error y tiempos.
+        """
+        with self._lock:
+            task = self._tasks.get(job_id)
+            if task is None:
+                return None
+            snapshot = {k: v for k, v in task.items() if not k.startswith("_")}
+            job = task["_job"]
+        if job is not None and snapshot["state"] == "running":
+            try:
+                snapshot["states"] = job.summary()
+            except Exception:
+                pass
+        return snapshot
+
+    def active(self):
+        """job_ids en cola o en curso"""
+        with self._lock:
+            return [j for j, t in self._tasks.items() if t["state"] in ("queued", "running")]
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._tasks[job_id].update(fields)
+
+    def _prune(self):
+        # Con el lock tomado: descarta trabajos terminados hace más de FINISHED_RETENTION
+        now = time.time()
+        for job_id, task in list(self._tasks.items()):
+            if task["finished"] and now - task["finished"] > FINISHED_RETENTION:
+                if task["zip_path"]:
+                    try:
+                        os.remove(task["zip_path"])
+                    except OSError:
+                        pass
+                del self._tasks[job_id]
+
+    def _run(self, job_id, rows, dois, metadata):
+        self._update(job_id, state="running", started=time.time())
+        try:
+            searcher = self.searcher_factory()
+            rows = _with_locations(searcher, rows, dois)
+            job = self.journal.open_job(dois) if self.journal is not None else None
+            output_dir = job.output_dir if job is not None else tempfile.mkdtemp(prefix="pdfs_")
+            self._update(job_id, _job=job)
+
+            zip_name = f"pdfs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+            zip_path = os.path.join(self.zip_dir, f"{job_id}_{zip_name}")
+            archive = PdfArchive(zip_path)
+            try:
+                stats = searcher.download_pdfs_from_rows(
+                    rows, output_dir,
+                    progress_callback=lambda done, total, downloaded: self._update(job_id, done=done, total=total, downloaded=downloaded),
+                    metadata=metadata,
+                    max_workers=self.workers_per_job,
+                    archive=archive,
+                    job=job,
+                )
+            finally:
+                archive.close()
+
+            # Terminado del todo: fuera del diario y sin carpeta; si quedan
+            # fallas transitorias, ambos se conservan para reintentar
+            complete = job is None or job.is_complete()
+            states = job.summary() if job is not None else {}
+            if job is not None and complete:
+                self.journal.delete_job(job.job_id)
+            if complete:
+                shutil.rmtree(output_dir, ignore_errors=True)
+            if stats["downloaded"] == 0:
+                os.remove(zip_path)
+                zip_path = zip_name = None
+            # Con el lock: un submit posterior ya ve "done" y no agrega callbacks
+            with self._lock:
+                callbacks = self._tasks[job_id]["_on_done"]
+                self._tasks[job_id].update(
+                    state="done", stats=stats, states=states, zip_path=zip_path, zip_name=zip_name,
+                    complete=complete, finished=time.time(), _job=None, _on_done=[],
+                )
+        except Exception as e:
+            self._update(job_id, state="error", error=str(e), finished=time.time(), _job=None, _on_done=[])
+            return
+        _notify(callbacks, stats)
@@ -2,14 +2,32 @@
 Sistema de Logging Anónimo para Búsquedas OpenAlex
 Registra búsquedas y resultados en Google Sheets sin datos personales
 GDPR-compliant: solo queries, parámetros y cifras agregadas
+
+El logger es uno por proceso (ver get_logger): autentica una sola vez y
+log_search solo arma la fila y la encola. Un thread de fondo la escribe con
+append_rows en lotes (cada LOG_BATCH_SIZE filas o LOG_FLUSH_SECONDS
+segundos); si Google Sheets no responde, las filas se guardan en un archivo
+local (spool) y se reenvían en el próximo lote que funcione.
 """
 
 import os
 import json
+import queue
+import atexit
 import hashlib
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+# Escritura en lotes a Google Sheets
+LOG_BATCH_SIZE = 20             # filas por append_rows
+LOG_FLUSH_SECONDS = 30.0        # espera máxima antes de enviar un lote incompleto
+LOG_SPOOL_MAX_ROWS = 10000      # tope del archivo local (se descartan las más viejas)
+LOG_SPOOL_PATH = os.getenv(
+    "OPENALEX_LOG_SPOOL",
+    os.path.join(os.getenv("OPENALEX_CACHE_DIR", ".openalex_cache"), "log_spool.jsonl"),
+)
+
 import streamlit as st
 
 # Importaciones opcionales (no rompen si faltan)
@@ -78,50 +96,163 @@ class OpenAlexLogger:
     - Solo un session_id hash anónimo por sesión
     """
 
-    def __init__(self, enabled: bool = True):
+    def __init__(
+        self,
+        enabled: bool = True,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_SECONDS,
+        spool_path: str = LOG_SPOOL_PATH,
+    ):
         """
         Inicializa el logger
 
         Args:
             enabled: Si False, todas las llamadas son no-op (útil para testing)
+            batch_size: Filas por lote enviado a Google Sheets
+            flush_interval: Segundos máximos que una fila espera en memoria
+            spool_path: Archivo local para las filas que no se pudieron enviar
         """
         self.enabled = enabled and GSPREAD_AVAILABLE
         self.client = None
         self.sheet = None
         self._initialized = False
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._init_warned = False
 
         if self.enabled:
-            self._initialize()
+            self._load_secrets()
 
-    def _initialize(self):
-        """Inicializa la conexión a Google Sheets (lazy loading)"""
+    def _load_secrets(self):
+        """Lee los secretos una sola vez (en el thread del script, donde st.secrets está disponible)"""
         try:
             # Cargar secretos de forma robusta (st.secrets, JSON embebido o env vars)
-            spreadsheet_name, creds_dict = load_google_sheets_secrets()
+            self._spreadsheet_name, self._creds_dict = load_google_sheets_secrets()
+            try:
+                self._sheet_key = st.secrets.get("google_sheets_key", "").strip()
+            except Exception:
+                self._sheet_key = os.getenv("GOOGLE_SHEETS_KEY", "").strip()
+        except Exception as e:
+            # Logging deshabilitado si no hay credenciales (no rompe la UI)
+            self.enabled = False
+            print(f"⚠️ Logger deshabilitado: {e}")
 
+    def _initialize(self):
+        """Autoriza y abre la hoja (desde el thread de fondo; se reintenta en el próximo lote si falla)"""
+        try:
             # Scopes necesarios para Google Sheets
             scopes = [
                 "https://www.googleapis.com/auth/spreadsheets",
                 "https://www.googleapis.com/auth/drive",
             ]
 
-            creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
+            creds = Credentials.from_service_account_info(self._creds_dict, scopes=scopes)
             self.client = gspread.authorize(creds)
 
             # Prioriza abrir por KEY; si no, por NAME
-            sheet_key = st.secrets.get("google_sheets_key", "").strip()
-            if sheet_key:
-                self.sheet = self.client.open_by_key(sheet_key).sheet1
+            if self._sheet_key:
+                self.sheet = self.client.open_by_key(self._sheet_key).sheet1
             else:
                 # cae al nombre (mantiene compatibilidad)
-                self.sheet = self.client.open(spreadsheet_name).sheet1
+                self.sheet = self.client.open(self._spreadsheet_name).sheet1
 
             self._initialized = True
 
         except Exception as e:
-            # Logging deshabilitado si falla la inicialización (no rompe la UI)
-            self.enabled = False
-            print(f"⚠️ Logger deshabilitado: {e}")
+            if not self._init_warned:
+                self._init_warned = True
+                print(f"⚠️ Google Sheets no disponible, las filas van al spool local: {e}")
+        return self._initialized
+
+    # ------------------------------------------------------------------
+    # Cola en memoria y thread de escritura
+    # ------------------------------------------------------------------
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="openalex-logger", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """Junta filas hasta completar un lote o vencer flush_interval y las envía"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = datetime.now().timestamp() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - datetime.now().timestamp()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # flush() encola un Event: corta el lote y se avisa al terminar
+            waiters = [item for item in batch if isinstance(item, threading.Event)]
+            rows = [item for item in batch if not isinstance(item, threading.Event)]
+            if rows or waiters:
+                self._flush_rows(rows)
+            for event in waiters:
+                event.set()
+
+    def _flush_rows(self, rows):
+        """Envía lo pendiente del spool más `rows` en un solo append_rows; si falla, todo queda en el spool"""
+        pending = self._read_spool() + rows
+        if not pending:
+            return
+        try:
+            if not self._initialized and not self._initialize():
+                raise RuntimeError("sin conexión a Google Sheets")
+            self.sheet.append_rows(pending, value_input_option="USER_ENTERED")
+        except Exception as e:
+            # La conexión puede haber caducado: reautorizar en el próximo lote
+            self._initialized = False
+            if rows:
+                self._append_spool(rows)
+            print(f"⚠️ Error en logging (no crítico), {len(pending)} filas en spool: {e}")
+            return
+        self._clear_spool()
+
+    def _read_spool(self):
+        try:
+            with open(self.spool_path, encoding="utf-8") as fh:
+                return [json.loads(line) for line in fh if line.strip()]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"⚠️ Spool de logging ilegible, se descarta: {e}")
+            self._clear_spool()
+            return []
+
+    def _append_spool(self, rows):
+        try:
+            parent = os.path.dirname(self.spool_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            spooled = self._read_spool() + rows
+            with open(self.spool_path, "w", encoding="utf-8") as fh:
+                for row in spooled[-LOG_SPOOL_MAX_ROWS:]:
+                    fh.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        except Exception as e:
+            print(f"⚠️ No se pudo escribir el spool de logging: {e}")
+
+    def _clear_spool(self):
+        try:
+            os.remove(self.spool_path)
+        except OSError:
+            pass
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Envía ya lo encolado (y el spool); espera hasta `timeout`. True si terminó"""
+        if not self.enabled:
+            return True
+        self._ensure_worker()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
 
     def log_search(
         self,
@@ -129,10 +260,13 @@ class OpenAlexLogger:
         search_params: Dict[str, Any],
         results_df: Any,  # pandas DataFrame
         pdf_stats: Optional[Dict[str, int]] = None,
+        session_id: Optional[str] = None,
     ):
         """
         Registra una búsqueda realizada
 
+        Solo arma la fila y la encola: no toca la red (ver _run).
+
         Args:
             query: Query de búsqueda ingresada por el usuario
             search_params: Diccionario con parámetros de búsqueda
@@ -152,6 +286,8 @@ class OpenAlexLogger:
                     'no_pdf': int,
                     'total': int
                 }
+            session_id: ID anónimo ya obtenido; obligatorio fuera del thread
+                        del script (ahí no hay st.session_state)
         """
         if not self.enabled:
             return
@@ -159,7 +295,8 @@ class OpenAlexLogger:
         try:
             # Calcular estadísticas de resultados
             total_found = len(results_df)
-            with_abstract = int(results_df["abstract"].notna().sum()) if total_found else 0
+            # Sin abstract: None (no se pidió) o "" (la obra no tiene)
+            with_abstract = int((results_df["abstract"].fillna("") != "").sum()) if total_found else 0
 
             # Columna open_access puede ser booleana; si no existe, tomar 0
             if "open_access" in results_df.columns:
@@ -175,7 +312,7 @@ class OpenAlexLogger:
                 avg_citations = 0.0
 
             # Generar session ID anónimo
-            session_id = self._get_session_id()
+            session_id = session_id or self._get_session_id()
 
             # Preparar fila para Google Sheets
             row = [
@@ -208,28 +345,16 @@ class OpenAlexLogger:
                 (pdf_stats or {}).get("total", 0),
             ]
 
-            # Escribir a Google Sheets (no bloquea UI en caso de error)
-            if self._initialized:
-                self.sheet.append_row(row, value_input_option="USER_ENTERED")
+            # Encolar: el thread de fondo la envía con el próximo lote
+            self._queue.put(row)
+            self._ensure_worker()
 
         except Exception as e:
             # Silencioso: no romper la app si falla el logging
             print(f"⚠️ Error en logging (no crítico): {e}")
 
     def _get_session_id(self) -> str:
-        """
-        Genera un ID anónimo único por sesión de Streamlit
-
-        Returns:
-            Hash SHA256 de 16 caracteres (no identificable personalmente)
-        """
-        if "anonymous_session_id" not in st.session_state:
-            # Generar hash basado en timestamp + bytes aleatorios
-            raw_data = f"{datetime.now().timestamp()}{os.urandom(16).hex()}"
-            hash_hex = hashlib.sha256(raw_data.encode()).hexdigest()
-            st.session_state["anonymous_session_id"] = hash_hex[:16]
-
-        return st.session_state["anonymous_session_id"]
+        return anonymous_session_id()
 
     @staticmethod
     def create_spreadsheet_header():
@@ -262,18 +387,51 @@ class OpenAlexLogger:
         ]
 
 
+def anonymous_session_id() -> str:
+    """
+    Genera un ID anónimo único por sesión de Streamlit
+
+    Returns:
+        Hash SHA256 de 16 caracteres (no identificable personalmente)
+    """
+    if "anonymous_session_id" not in st.session_state:
+        # Generar hash basado en timestamp + bytes aleatorios
+        raw_data = f"{datetime.now().timestamp()}{os.urandom(16).hex()}"
+        hash_hex = hashlib.sha256(raw_data.encode()).hexdigest()
+        st.session_state["anonymous_session_id"] = hash_hex[:16]
+
+    return st.session_state["anonymous_session_id"]
+
+
+_default_logger = None
+_default_logger_lock = threading.Lock()
+
+
+def get_logger() -> OpenAlexLogger:
+    """Logger compartido por todo el proceso (autentica una sola vez)"""
+    global _default_logger
+    with _default_logger_lock:
+        if _default_logger is None:
+            _default_logger = OpenAlexLogger()
+            # Al salir, enviar (o dejar en el spool) lo que quedó en memoria
+            atexit.register(_default_logger.flush, 10.0)
+        return _default_logger
+
+
 # Función helper para uso simple (API estable)
-def log_search_event(query, search_params, results_df, pdf_stats=None):
+def log_search_event(query, search_params, results_df, pdf_stats=None, session_id=None):
     """
     Helper function para logging simple
 
     Uso:
         from openalex_logger import log_search_event
         log_search_event(query, params, df)
+
+    Desde un thread de fondo (p. ej. al terminar una descarga) hay que pasar
+    session_id=anonymous_session_id() obtenido antes en el script.
     """
     try:
-        logger = OpenAlexLogger()
-        logger.log_search(query, search_params, results_df, pdf_stats)
+        get_logger().log_search(query, search_params, results_df, pdf_stats, session_id)
     except Exception:
         # Completamente silencioso si falla
         pass
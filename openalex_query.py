@@ -0,0 +1,209 @@
+# openalex_query.py — compilador local de consultas booleanas para OpenAlex
+"""
+Compilador de la sintaxis de búsqueda documentada en la app
+
+    peronismo AND argentina
+    "Juan Perón" OR "Eva Perón"
+    peronismo NOT militar
+    (peronismo OR justicialismo) AND argentina
+    peronismo, peronism, justicialismo      → peronismo OR peronism OR justicialismo
+
+Los operadores van en MAYÚSCULAS; entre grupos (frases, paréntesis) sin
+operador se asume AND, y las palabras sueltas seguidas se envían tal cual.
+La consulta se valida antes de llamar a la API (QueryError con la posición
+del problema) y se reescribe con operadores y paréntesis explícitos, lista
+para `search` o para los filtros `*.search` de OpenAlex.
+"""
+
+import re
+
+# search_type de la app → filtro de OpenAlex (None = parámetro `search`)
+SEARCH_FIELDS = {
+    "title_abstract": "title_and_abstract.search",
+    "title_only": "title.search",
+    "general": None,
+}
+
+_OPERATORS = ("AND", "OR", "NOT")
+
+# Término suelto: todo lo que no sea espacio, paréntesis, coma o comillas.
+# `|` y `,` separan valores y filtros en OpenAlex: no pueden ir en un término
+# y dentro de una frase se reemplazan por espacios (OpenAlex ignora la
+# puntuación al buscar, así que la frase no cambia)
+_WORD_RE = re.compile(r'[^\s(),"|]+')
+_PHRASE_SEPARATORS = str.maketrans({"|": " ", ",": " "})
+
+
+class QueryError(ValueError):
+    """Consulta mal formada (se detecta sin llamar a la API)"""
+
+
+def _tokenize(query):
+    tokens = []
+    i, n = 0, len(query)
+    while i < n:
+        c = query[i]
+        if c.isspace():
+            i += 1
+        elif c == '"':
+            end = query.find('"', i + 1)
+            if end == -1:
+                raise QueryError(f"Comillas sin cerrar (posición {i + 1})")
+            phrase = " ".join(query[i + 1:end].translate(_PHRASE_SEPARATORS).split())
+            if not phrase:
+                raise QueryError(f"Frase vacía entre comillas (posición {i + 1})")
+            tokens.append(("PHRASE", phrase, i))
+            i = end + 1
+        elif c in "()":
+            tokens.append((c, c, i))
+            i += 1
+        elif c == ",":
+            # Búsqueda multilingüe: la coma equivale a OR
+            tokens.append(("OR", c, i))
+            i += 1
+        elif c == "|":
+            raise QueryError(f"Carácter '|' no admitido (posición {i + 1}); use OR")
+        else:
+            word = _WORD_RE.match(query, i).group()
+            tokens.append((word if word in _OPERATORS else "TERM", word, i))
+            i += len(word)
+    return tokens
+
+
+class _Parser:
+    """
+    Descenso recursivo sobre los tokens
+
+        or    := and (OR and)*
+        and   := unary ([AND] unary)*
+        unary := NOT unary | TERM | PHRASE | "(" or ")"
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def _where(self):
+        if self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            return f"en '{tok[1]}' (posición {tok[2] + 1})"
+        return "al final de la consulta"
+
+    def parse(self):
+        if not self.tokens:
+            raise QueryError("La consulta está vacía")
+        node = self._or()
+        if self.pos < len(self.tokens):
+            raise QueryError(f"Paréntesis de cierre sin abrir {self._where()}")
+        return node
+
+    def _or(self):
+        items = [self._and()]
+        while self._peek() == "OR":
+            self.pos += 1
+            items.append(self._and())
+        return items[0] if len(items) == 1 else ("OR", items)
+
+    def _and(self):
+        items = [self._unary()]
+        while self._peek() not in (None, "OR", ")"):
+            explicit = self._peek() == "AND"
+            if explicit:
+                self.pos += 1
+            item = self._unary()
+            if not explicit and item[0] == "TERM" and items[-1][0] == "TERM":
+                # Palabras sueltas seguidas se envían tal cual ("historia argentina"):
+                # OpenAlex ya las combina y así no se fuerzan las palabras vacías
+                items[-1] = ("TERM", f"{items[-1][1]} {item[1]}")
+            else:
+                items.append(item)
+        return items[0] if len(items) == 1 else ("AND", items)
+
+    def _unary(self):
+        kind = self._peek()
+        if kind == "NOT":
+            self.pos += 1
+            return ("NOT", self._unary())
+        if kind in ("TERM", "PHRASE"):
+            tok = self.tokens[self.pos]
+            self.pos += 1
+            return (kind, tok[1])
+        if kind == "(":
+            start = self.tokens[self.pos][2]
+            self.pos += 1
+            if self._peek() == ")":
+                raise QueryError(f"Paréntesis vacíos (posición {start + 1})")
+            node = self._or()
+            if self._peek() != ")":
+                raise QueryError(f"Paréntesis sin cerrar (posición {start + 1})")
+            self.pos += 1
+            return node
+        raise QueryError(f"Se esperaba un término {self._where()}")
+
+
+def _flatten(node):
+    """Une operadores iguales anidados: (a OR (b OR c)) → a OR b OR c"""
+    kind = node[0]
+    if kind == "NOT":
+        return ("NOT", _flatten(node[1]))
+    if kind not in ("AND", "OR"):
+        return node
+    items = []
+    for child in map(_flatten, node[1]):
+        items.extend(child[1] if child[0] == kind else [child])
+    return (kind, items)
+
+
+def _render(node):
+    kind = node[0]
+    if kind == "TERM":
+        return node[1]
+    if kind == "PHRASE":
+        return f'"{node[1]}"'
+    if kind == "NOT":
+        raise QueryError("NOT solo puede excluir términos de un AND (ej.: peronismo NOT militar)")
+
+    def _child(n):
+        text = _render(n)
+        grouped = n[0] in ("AND", "OR") or (n[0] == "TERM" and " " in n[1])
+        return f"({text})" if grouped else text
+
+    if kind == "OR":
+        return " OR ".join(_child(n) for n in node[1])
+
+    # AND: primero los términos positivos y después las exclusiones con NOT
+    positives = [n for n in node[1] if n[0] != "NOT"]
+    negatives = [n[1] for n in node[1] if n[0] == "NOT"]
+    if not positives:
+        raise QueryError("La consulta no puede estar formada solo por exclusiones (NOT)")
+    text = " AND ".join(_child(n) for n in positives)
+    for n in negatives:
+        if n[0] == "NOT":
+            raise QueryError("Doble negación (NOT NOT) no admitida")
+        text += f" NOT {_child(n)}"
+    return text
+
+
+def compile_query(query):
+    """
+    Valida la consulta y la devuelve normalizada para OpenAlex
+
+    Raises:
+        QueryError: Comillas o paréntesis sin cerrar, operadores sin
+                    término, consulta vacía o solo exclusiones
+    """
+    return _render(_flatten(_Parser(_tokenize(query or "")).parse()))
+
+
+def search_field_for(search_type):
+    """Filtro `*.search` para un search_type de la app (None = `search` general)"""
+    try:
+        return SEARCH_FIELDS[search_type]
+    except KeyError:
+        raise ValueError(
+            f"Tipo de búsqueda desconocido: {search_type!r} "
+            f"(opciones: {', '.join(SEARCH_FIELDS)})"
+        ) from None
@@ -0,0 +1,184 @@
+# openalex_ratelimit.py — límite de requests a la API de OpenAlex compartido por el proceso
+"""
+Control de ritmo y presupuesto diario para la API de OpenAlex
+
+OpenAlex admite ~10 requests/segundo y 100.000 requests/día por usuario
+(mailto). En el taller muchas sesiones de Streamlit comparten el mismo
+mailto y el mismo proceso: todas las instancias de OpenAlexSearcher usan un
+único OpenAlexRateLimiter (ver get_default_rate_limiter) que
+
+- espacia los requests a `rate` por segundo con ráfagas de hasta `burst`
+  (los que exceden esperan su turno en vez de fallar),
+- ante un 429/403 de OpenAlex frena a todo el proceso con backoff
+  exponencial con jitter (respetando Retry-After si viene),
+- lleva la cuenta del presupuesto diario (se reinicia a medianoche UTC, como
+  en OpenAlex) y la expone para la interfaz.
+"""
+
+import time
+import random
+import threading
+from datetime import datetime, timezone
+
+API_RATE = 10.0               # requests por segundo a api.openalex.org
+API_BURST = 10                # ráfaga máxima
+API_DAILY_BUDGET = 100000     # requests por día (límite de OpenAlex por usuario)
+API_MAX_ATTEMPTS = 6          # intentos por request ante 429/403/5xx/errores de red
+BACKOFF_BASE = 1.0            # segundos del primer reintento
+BACKOFF_MAX = 60.0            # tope de espera entre reintentos
+
+
+class OpenAlexRateLimitError(RuntimeError):
+    """OpenAlex sigue rechazando el request después de todos los reintentos"""
+
+
+class OpenAlexBudgetExceeded(OpenAlexRateLimitError):
+    """Se agotó el presupuesto diario de requests"""
+
+
+def _utc_day():
+    return datetime.now(timezone.utc).date()
+
+
+def _parse_retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class OpenAlexRateLimiter:
+    """
+    Ritmo (GCRA, equivalente a un token bucket) + cooldown global + presupuesto
+
+    reserve() no duerme: devuelve cuántos segundos esperar, así sirve tanto
+    para el cliente con threads (acquire) como para el motor asyncio.
+
+    Args:
+        rate: Requests por segundo
+        burst: Ráfaga máxima
+        daily_budget: Requests por día UTC
+    """
+
+    def __init__(self, rate=API_RATE, burst=API_BURST, daily_budget=API_DAILY_BUDGET):
+        self.interval = 1.0 / float(rate)
+        self.tolerance = (max(int(burst), 1) - 1) * self.interval
+        self.daily_budget = daily_budget
+        self.lock = threading.Lock()
+        self._tat = 0.0               # próximo turno teórico (GCRA)
+        self._cooldown_until = 0.0
+        self._day = _utc_day()
+        self._used = 0
+        self._server_remaining = None
+        self.throttled = 0            # 429/403 recibidos
+        self.waited = 0.0             # segundos totales en cola
+
+    def _roll_day(self):
+        today = _utc_day()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+            self._server_remaining = None
+
+    def reserve(self):
+        """
+        Reserva un turno y una unidad del presupuesto
+
+        Returns:
+            Segundos a esperar antes de enviar el request
+
+        Raises:
+            OpenAlexBudgetExceeded: Si no queda presupuesto diario
+        """
+        with self.lock:
+            self._roll_day()
+            if self._remaining() <= 0:
+                raise OpenAlexBudgetExceeded(
+                    f"Se agotó el presupuesto diario de OpenAlex ({self.daily_budget} requests); "
+                    "se renueva a medianoche UTC"
+                )
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            start = max(tat - self.tolerance, now, self._cooldown_until)
+            self._tat = max(tat, start) + self.interval
+            self._used += 1
+            delay = start - now
+            self.waited += delay
+            return delay
+
+    def acquire(self):
+        """Espera (bloqueando el thread) hasta que le toque al request"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self, attempt, retry_after=None, throttled=False):
+        """
+        Espera antes del reintento número `attempt` (0 = primero)
+
+        Backoff exponencial con jitter; si OpenAlex mandó Retry-After se
+        respeta como mínimo. Con throttled=True (429/403) la espera se aplica
+        a todo el proceso: los demás requests quedan en cola detrás.
+
+        Returns:
+            Segundos a esperar
+        """
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.0)
+        ra = _parse_retry_after(retry_after)
+        if ra is not None:
+            delay = max(delay, min(ra, BACKOFF_MAX))
+        if throttled:
+            with self.lock:
+                self.throttled += 1
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        return delay
+
+    def update_from_headers(self, headers):
+        """Toma el remanente informado por OpenAlex (X-RateLimit-Remaining), si viene"""
+        value = headers.get("X-RateLimit-Remaining") if headers else None
+        if value is None:
+            return
+        try:
+            remaining = int(value)
+        except ValueError:
+            return
+        with self.lock:
+            self._server_remaining = remaining
+
+    def _remaining(self):
+        local = self.daily_budget - self._used
+        if self._server_remaining is not None:
+            return min(local, self._server_remaining)
+        return local
+
+    def remaining(self):
+        """Requests que quedan hoy (UTC)"""
+        with self.lock:
+            self._roll_day()
+            return max(0, self._remaining())
+
+    def status(self):
+        """Estado para mostrar en la interfaz"""
+        with self.lock:
+            self._roll_day()
+            return {
+                "used": self._used,
+                "remaining": max(0, self._remaining()),
+                "daily_budget": self.daily_budget,
+                "throttled": self.throttled,
+                "cooldown": max(0.0, self._cooldown_until - time.monotonic()),
+                "waited": self.waited,
+            }
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter():
+    """Limitador compartido por todas las instancias del proceso"""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = OpenAlexRateLimiter()
+        return _default_limiter
@@ -0,0 +1,216 @@
+# openalex_resolvers.py — resolvers de PDF por editorial/repositorio (sin scraping)
+"""
+Plugins que derivan la URL del PDF directamente del DOI o de la URL de la
+landing, sin descargar ni parsear su HTML
+
+Cada plugin declara prefijos de DOI y/o patrones de host que lo activan:
+
+- Por prefijo de DOI (p. ej. arXiv, 10.48550) los candidatos salen del DOI
+  solo, antes de cualquier request.
+- Por host (OJS, SciELO, Redalyc, PMC) hace falta la URL final de la
+  landing: OpenAlexSearcher sigue la redirección de doi.org y lee solo los
+  encabezados; el HTML se descarga únicamente si los plugins fallan.
+
+Para agregar un repositorio: subclase de PdfResolver + @register.
+"""
+
+import re
+import threading
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+
+class PdfResolver:
+    """
+    Base de los plugins
+
+    Atributos:
+        name: Identificador (aparece en el flow log y en el método de descarga)
+        doi_prefixes: Prefijos de DOI que activan el plugin sin landing
+        host_patterns: Regex sobre el host de la landing
+    """
+
+    name = ""
+    doi_prefixes = ()
+    host_patterns = ()
+
+    def matches_doi(self, doi):
+        return any(doi.startswith(prefix + "/") for prefix in self.doi_prefixes)
+
+    def matches_host(self, host):
+        return any(re.search(pattern, host) for pattern in self.host_patterns)
+
+    def from_doi(self, doi):
+        """Candidatos a partir del DOI normalizado (minúsculas, sin https://doi.org/)"""
+        return []
+
+    def from_landing(self, url):
+        """Candidatos a partir de la URL final de la landing"""
+        return []
+
+
+RESOLVERS = []
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def register(cls):
+    """Decorador: agrega el plugin al registro (en orden de prioridad)"""
+    RESOLVERS.append(cls())
+    return cls
+
+
+def doi_candidates(doi):
+    """[(plugin, [urls])] de los plugins activados por el prefijo del DOI"""
+    doi = (doi or "").strip().lower()
+    out = []
+    for resolver in RESOLVERS:
+        if resolver.matches_doi(doi):
+            urls = resolver.from_doi(doi)
+            if urls:
+                out.append((resolver.name, urls))
+    return out
+
+
+def landing_candidates(url):
+    """[(plugin, [urls])] de los plugins activados por el host de la landing"""
+    host = urlparse(url or "").netloc.lower()
+    out = []
+    for resolver in RESOLVERS:
+        if host and resolver.matches_host(host):
+            urls = resolver.from_landing(url)
+            if urls:
+                out.append((resolver.name, urls))
+    return out
+
+
+def record(name, hit):
+    """Acumula un intento del plugin en el proceso; devuelve su tasa de aciertos"""
+    with _stats_lock:
+        entry = _stats.setdefault(name, {"tried": 0, "hits": 0})
+        entry["tried"] += 1
+        entry["hits"] += int(bool(hit))
+        return entry["hits"] / entry["tried"]
+
+
+def resolver_stats():
+    """{plugin: {"tried", "hits", "hit_rate"}} acumulado en el proceso"""
+    with _stats_lock:
+        return {
+            name: dict(entry, hit_rate=entry["hits"] / entry["tried"] if entry["tried"] else 0.0)
+            for name, entry in _stats.items()
+        }
+
+
+def _with_query(url, **params):
+    parts = urlparse(url)
+    query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+    query.update(params)
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+@register
+class ArxivResolver(PdfResolver):
+    """arXiv: 10.48550/arXiv.<id> y arxiv.org/abs/<id> → arxiv.org/pdf/<id>"""
+
+    name = "arxiv"
+    doi_prefixes = ("10.48550",)
+    host_patterns = (r"(^|\.)arxiv\.org$",)
+
+    def from_doi(self, doi):
+        match = re.match(r"10\.48550/arxiv\.(.+)$", doi)
+        return [f"https://arxiv.org/pdf/{match.group(1)}"] if match else []
+
+    def from_landing(self, url):
+        match = re.search(r"/abs/([^?#]+)", urlparse(url).path)
+        return [f"https://arxiv.org/pdf/{match.group(1)}"] if match else []
+
+
+@register
+class PmcResolver(PdfResolver):
+    """PubMed Central: /articles/PMC<n>/ → /articles/PMC<n>/pdf/"""
+
+    name = "pmc"
+    host_patterns = (r"(^|\.)pmc\.ncbi\.nlm\.nih\.gov$", r"(^|\.)ncbi\.nlm\.nih\.gov$", r"(^|\.)europepmc\.org$")
+
+    def from_landing(self, url):
+        match = re.search(r"(PMC\d+)", url, re.IGNORECASE)
+        if not match:
+            return []
+        pmcid = match.group(1).upper()
+        return [
+            f"https://pmc.ncbi.nlm.nih.gov/articles/{pmcid}/pdf/",
+            f"https://europepmc.org/backend/ptpmcrender.fcgi?accid={pmcid}&blobtype=pdf",
+        ]
+
+
+@register
+class ScieloResolver(PdfResolver):
+    """
+    SciELO (scielo.br, scielo.org.ar, scielo.cl, ...)
+
+    Nueva plataforma: /j/<rev>/a/<id>/ → ?format=pdf
+    Clásica: scielo.php?script=sci_arttext&pid=... → script=sci_pdf
+    """
+
+    name = "scielo"
+    host_patterns = (r"(^|\.)scielo\.",)
+
+    def from_landing(self, url):
+        parts = urlparse(url)
+        query = parse_qs(parts.query)
+        if "/j/" in parts.path and "/a/" in parts.path:
+            lang = (query.get("lang") or [None])[0]
+            params = {"format": "pdf"}
+            if lang:
+                params["lang"] = lang
+            return [_with_query(url, **params)]
+        if parts.path.endswith("scielo.php") and query.get("pid"):
+            return [_with_query(url, script="sci_pdf")]
+        return []
+
+
+@register
+class RedalycResolver(PdfResolver):
+    """
+    Redalyc
+
+    articulo.oa?id=<revista><8 dígitos> → /pdf/<revista>/<id>.pdf
+    /journal/<revista>/<id>/html/ → /journal/<revista>/<id>/<id>.pdf
+    """
+
+    name = "redalyc"
+    host_patterns = (r"(^|\.)redalyc\.org$",)
+
+    def from_landing(self, url):
+        parts = urlparse(url)
+        base = f"{parts.scheme or 'https'}://{parts.netloc}"
+        match = re.search(r"/journal/(\d+)/(\d+)", parts.path)
+        if match:
+            journal, art = match.groups()
+            return [f"{base}/journal/{journal}/{art}/{art}.pdf"]
+        art = (parse_qs(parts.query).get("id") or [""])[0]
+        if art.isdigit() and len(art) > 8:
+            return [f"{base}/pdf/{art[:-8]}/{art}.pdf"]
+        return []
+
+
+@register
+class OjsResolver(PdfResolver):
+    """
+    Open Journal Systems en cualquier dominio
+
+    .../article/view/<id>/<galley> → .../article/download/<id>/<galley>
+    (sin galley no se puede derivar: queda para el scraping)
+    """
+
+    name = "ojs"
+    host_patterns = (r".",)
+
+    def from_landing(self, url):
+        parts = urlparse(url)
+        match = re.search(r"^(.*/article/)view(/\d+/\d+)/?$", parts.path, re.IGNORECASE)
+        if not match:
+            return []
+        path = f"{match.group(1)}download{match.group(2)}"
+        return [urlunparse(parts._replace(path=path, query="", fragment=""))]
@@ -3,9 +3,38 @@
 import os
 import time
 import json
+import zipfile
+import threading
 import requests
-from urllib.parse import urlencode, urljoin
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from array import array
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlencode, urljoin, urlparse
+from bs4 import BeautifulSoup, SoupStrainer
+
+from openalex_query import compile_query, search_field_for
+from openalex_ratelimit import API_MAX_ATTEMPTS, OpenAlexRateLimitError, get_default_rate_limiter
+from openalex_resolvers import doi_candidates, landing_candidates, record as record_plugin
+
+# orjson decodifica JSON bastante más rápido que json; se usa si está instalado
+try:
+    import orjson
+    JSON_DECODER = "orjson"
+
+    def _loads(raw):
+        return orjson.loads(raw)
+except ImportError:
+    JSON_DECODER = "json"
+
+    def _loads(raw):
+        return json.loads(raw)
+
+# Parser de BeautifulSoup para las landing pages. lxml es más rápido pero arma
+# otro árbol con el HTML mal formado (frecuente en OJS y repositorios), y los
+# candidatos a PDF se verificaron solo con html.parser: no cambiar sin
+# comparar antes los resultados de ambos
+HTML_PARSER = "html.parser"
 
 OPENALEX_BASE = "https://api.openalex.org/works"
 
@@ -15,6 +44,130 @@ SELECT_FIELDS = (
     "cited_by_count,open_access,best_oa_location,abstract_inverted_index,locations"
 )
 
+# Perfiles de proyección (`select`): solo se piden los campos que se van a usar.
+# Los abstracts dominan el tamaño de la respuesta; el perfil "table" los omite
+# y se pueden pedir después con fetch_abstracts() para las filas abiertas.
+_TABLE_FIELDS = (
+    "id,doi,display_name,publication_year,primary_location,"
+    "authorships,cited_by_count,open_access,best_oa_location"
+)
+SELECT_PROFILES = {
+    "table": _TABLE_FIELDS,
+    "abstracts": _TABLE_FIELDS + ",abstract_inverted_index",
+    "download": _TABLE_FIELDS + ",locations",
+    "full": SELECT_FIELDS,
+}
+
+# Columnas de cada fila de resultados (orden de _extract_values)
+ROW_COLUMNS = (
+    "title", "author", "publication", "year", "citations", "doi",
+    "openalex_id", "open_access", "abstract", "oa_pdf_url", "oa_landing_url",
+    "pdf_urls",
+)
+
+def _select_for(profile):
+    try:
+        return SELECT_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Perfil de campos desconocido: {profile!r} (opciones: {', '.join(SELECT_PROFILES)})")
+
+# Orden de preferencia entre las `locations` de una obra al buscar su PDF:
+# repositorios (sirven el archivo directo, sin muros anti-bots) antes que
+# revistas, y dentro de cada uno la versión publicada antes que la aceptada
+# o el preprint. A igualdad, manda el orden de OpenAlex (best_oa_location primero).
+LOCATION_SOURCE_ORDER = ("repository", "journal")
+LOCATION_VERSION_ORDER = ("publishedVersion", "acceptedVersion", "submittedVersion")
+
+def _location_pdf_urls(w):
+    """URLs de PDF conocidas por OpenAlex para una obra, sin repetir y en orden de preferencia"""
+    prim = w.get("primary_location") or {}
+    locations = [w.get("best_oa_location") or {}] + list(w.get("locations") or []) + [prim if isinstance(prim, dict) else {}]
+
+    def _rank(item):
+        pos, loc = item
+        source_type = (loc.get("source") or {}).get("type")
+        version = loc.get("version")
+        return (
+            LOCATION_SOURCE_ORDER.index(source_type) if source_type in LOCATION_SOURCE_ORDER else len(LOCATION_SOURCE_ORDER),
+            LOCATION_VERSION_ORDER.index(version) if version in LOCATION_VERSION_ORDER else len(LOCATION_VERSION_ORDER),
+            pos,
+        )
+
+    ranked = sorted(enumerate(loc for loc in locations if isinstance(loc, dict)), key=_rank)
+    return _dedup([loc["pdf_url"] for _, loc in ranked if loc.get("pdf_url")])
+
+def _row_pdf_urls(row):
+    """pdf_urls de una fila de resultados (con oa_pdf_url si la fila no las trae)"""
+    urls = row.get("pdf_urls")
+    urls = list(urls) if isinstance(urls, (list, tuple)) else []
+    oa_pdf = row.get("oa_pdf_url")
+    if isinstance(oa_pdf, str) and oa_pdf and oa_pdf not in urls:
+        urls.append(oa_pdf)
+    return urls
+
+# Heurísticas de la landing page (ver OpenAlexSearcher._analyze_landing)
+_LANDING_TAGS = ["meta", "link", "a", "iframe", "embed", "object"]
+
+# Lista extendida de meta tags que pueden contener URL del PDF
+_META_PDF_NAMES = [
+    "citation_pdf_url",
+    "pdf_url",
+    "og:pdf",
+    "dc.identifier.uri",
+    "dc.relation.uri",
+    "bepress_citation_pdf_url",
+    "fulltext_pdf"
+]
+
+_VIEW_PATTERNS = [
+    "view", "/article/view", "/viewarticle",
+    "fulltext", "full-text", "full_text",
+    "/ver", "leer"
+]
+
+_DIRECT_HREF_PATTERNS = [".pdf", "download", "descargar", "pdf", "galley", "/article/download"]
+_DIRECT_TEXT_PATTERNS = ["pdf", "download", "descargar", "texto completo", "full text", "ver pdf", "view pdf"]
+
+def _parse_html(html_bytes):
+    """Parsea solo los tags que usan las heurísticas (meta, link, a, iframe, embed, object)"""
+    return BeautifulSoup(html_bytes, HTML_PARSER, parse_only=SoupStrainer(_LANDING_TAGS))
+
+def _dedup(items):
+    """Deduplica preservando el orden"""
+    seen, result = set(), []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+# DOIs por request en get_works_by_dois (filtro OR de OpenAlex)
+DOI_CHUNK_SIZE = 50
+
+# Paginado numerado (page=N): OpenAlex solo lo admite para los primeros
+# 10.000 resultados; más allá hay que seguir el cursor
+PAGE_WINDOW = 10000
+PAGE_FETCH_WORKERS = 4
+# Segundos por página que asume preflight() mientras no haya ninguna medida
+PREFLIGHT_DEFAULT_LATENCY = 1.0
+
+# Facetas de summarize(): clave del resumen → campo de group_by en OpenAlex
+SUMMARY_GROUPS = {
+    "years": "publication_year",
+    "oa_status": "open_access.oa_status",
+    "venues": "primary_location.source.id",
+    "institutions": "authorships.institutions.id",
+}
+
+def _normalize_doi(doi):
+    """DOI sin prefijo de URL ni `doi:`, en minúsculas (OpenAlex los guarda así)"""
+    d = (doi or "").strip()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:"):
+        if d.lower().startswith(prefix):
+            d = d[len(prefix):]
+            break
+    return d.strip().lower()
+
 def _safe_progress(cb, *args):
     if not cb:
         return
@@ -161,57 +314,586 @@ def _generate_descriptive_filename(index, title, author, doi, max_total_length=1
 
     return filename
 
+# Cortesía con los servidores de las editoriales: límites por dominio
+HOST_MAX_CONCURRENCY = 2      # requests simultáneos por dominio
+HOST_RATE = 2.0               # requests por segundo por dominio
+HOST_BURST = 4                # ráfaga máxima permitida por dominio
+HOST_OVERRIDES = {
+    # doi.org solo redirige; todos los DOIs pasan por ahí
+    "doi.org": (8, 10.0, 10),
+}
+
+class _TokenBucket:
+    """Token bucket simple: `rate` tokens por segundo, hasta `burst` acumulados"""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class _ProbeCancelled(Exception):
+    """El sondeo se descartó (su carrera ya tiene ganador) antes de terminar"""
+
+# Cada cuánto revisa un sondeo en espera si su carrera ya se decidió
+HOST_CANCEL_POLL = 0.05
+
+class HostScheduler:
+    """
+    Planificador de requests por dominio
+
+    Cada dominio tiene un semáforo (concurrencia máxima) y un token bucket
+    (tasa máxima). Todos los GET/HEAD hacia editoriales pasan por `request`.
+    """
+
+    def __init__(self, max_concurrency=HOST_MAX_CONCURRENCY, rate=HOST_RATE, burst=HOST_BURST, overrides=None):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.overrides = dict(HOST_OVERRIDES if overrides is None else overrides)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url):
+        host = (urlparse(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                conc, rate, burst = self.overrides.get(host, (self.max_concurrency, self.rate, self.burst))
+                state = (threading.BoundedSemaphore(conc), _TokenBucket(rate, burst))
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, url, consume_token=True, cancel=None):
+        """
+        Reserva un lugar para `url` respetando concurrencia y tasa de su dominio
+
+        Con `cancel` (threading.Event) la espera se abandona, sin ocupar el
+        lugar, apenas se activa el evento (ver _ProbeCancelled).
+        """
+        sem, bucket = self._state(self.host_of(url))
+        if cancel is None:
+            sem.acquire()
+        else:
+            while not sem.acquire(timeout=HOST_CANCEL_POLL):
+                if cancel.is_set():
+                    raise _ProbeCancelled(url)
+        try:
+            if consume_token:
+                bucket.acquire()
+            if cancel is not None and cancel.is_set():
+                raise _ProbeCancelled(url)
+            yield
+        finally:
+            sem.release()
+
+    def request(self, session, method, url, allow_redirects=True, cancel=None, on_start=None, **kwargs):
+        """
+        Request con los límites del dominio de cada salto
+
+        Las redirecciones se siguen a mano: doi.org → editorial → CDN son
+        requests distintos y cada uno reserva su lugar en su propio dominio.
+        Como en requests, la respuesta final trae los saltos en `history`.
+
+        Args:
+            cancel: threading.Event opcional; si se activa, el request se
+                    abandona (_ProbeCancelled) antes del salto siguiente y
+                    la respuesta que llegue se cierra
+            on_start: Se llama una vez, al conseguir el lugar del primer salto
+        """
+        history = []
+        for _ in range(session.max_redirects + 1):
+            with self.slot(url, cancel=cancel):
+                if on_start is not None:
+                    on_start()
+                    on_start = None
+                r = session.request(method, url, allow_redirects=False, **kwargs)
+            if cancel is not None and cancel.is_set():
+                r.close()
+                raise _ProbeCancelled(url)
+            target = session.get_redirect_target(r) if allow_redirects else None
+            if not target:
+                r.history = history
+                return r
+            r.close()
+            history.append(r)
+            url = urljoin(r.url, target)
+            # 303 (y 301/302 tras un POST) continúan como GET, igual que requests
+            if r.status_code == 303 or (r.status_code in (301, 302) and method.upper() == "POST"):
+                method = "GET"
+                kwargs.pop("data", None)
+                kwargs.pop("json", None)
+        raise requests.TooManyRedirects(f"Más de {session.max_redirects} redirecciones", response=r)
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+def _get_default_scheduler():
+    """Scheduler compartido por todas las instancias del proceso"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = HostScheduler()
+        return _default_scheduler
+
+# Pool HTTP compartido por el proceso: keep-alive entre búsquedas, clics y
+# sesiones de Streamlit (el módulo se importa una sola vez por proceso). Lo
+# compartido es el adaptador; cookies y encabezados van en una Session por
+# searcher, para que no pasen de un usuario (o trabajo de descarga) a otro
+POOL_HOSTS = 64               # dominios con conexiones abiertas a la vez
+POOL_PER_HOST = 16            # conexiones reutilizables por dominio
+
+_DEFAULT_HEADERS = {
+    "User-Agent": "OpenAlex-Streamlit/1.4 (+mailto)",
+    "Accept": "application/json",
+    "Accept-Language": "en-US,en;q=0.8",
+}
+
+_shared_adapter = None
+_shared_adapter_lock = threading.Lock()
+
+def get_shared_adapter():
+    """HTTPAdapter (pool de conexiones, thread-safe) compartido por todo el proceso"""
+    global _shared_adapter
+    with _shared_adapter_lock:
+        if _shared_adapter is None:
+            _shared_adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+        return _shared_adapter
+
+def new_session():
+    """Session propia (cookies, encabezados) montada sobre el pool compartido"""
+    session = requests.Session()
+    adapter = get_shared_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(_DEFAULT_HEADERS)
+    return session
+
+def pool_stats(session=None):
+    """
+    Uso del pool de conexiones por dominio (diagnóstico)
+
+    Args:
+        session: Session cuyos adaptadores se inspeccionan (por defecto, el
+                 pool compartido del proceso)
+
+    Returns:
+        {host: {"requests", "new_connections", "reused"}} para los dominios
+        con pool abierto (los expulsados por POOL_HOSTS no figuran)
+    """
+    if session is None:
+        adapters = {0: get_shared_adapter()}
+    else:
+        adapters = {id(a): a for a in session.adapters.values() if isinstance(a, HTTPAdapter)}
+    stats = {}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            entry = stats.setdefault(pool.host, {"requests": 0, "new_connections": 0})
+            entry["requests"] += pool.num_requests
+            entry["new_connections"] += pool.num_connections
+    for entry in stats.values():
+        entry["reused"] = max(0, entry["requests"] - entry["new_connections"])
+    return stats
+
+class _PageLatency:
+    """Promedio móvil (EWMA) de lo que tarda OpenAlex en devolver una página"""
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.value = None
+        self.samples = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            if self.value is None:
+                self.value = seconds
+            else:
+                self.value = self.alpha * seconds + (1 - self.alpha) * self.value
+            self.samples += 1
+
+    def estimate(self):
+        with self.lock:
+            return self.value
+
+# Medido en todas las instancias del proceso (solo requests reales, no caché)
+_page_latency = _PageLatency()
+
+class PdfArchive:
+    """
+    ZIP en disco que se arma mientras avanzan las descargas
+
+    Los PDFs ya vienen comprimidos, así que se guardan sin deflate
+    (ZIP_STORED). Cada PDF se agrega en cuanto termina de bajar, copiándolo
+    desde el archivo ya escrito: en memoria solo queda un bloque a la vez.
+
+    Esa copia es una segunda lectura del PDF, y es deliberada. Escribir los
+    bloques en la entrada del ZIP a medida que llegan exigiría tener el ZIP
+    tomado (un solo escritor a la vez) durante toda la descarga, y las
+    descargas en paralelo quedarían en fila. El archivo recién escrito
+    suele leerse desde la caché de páginas del sistema.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True)
+        self._lock = threading.Lock()
+        self.names = set()
+        self.count = 0
+
+    def _claim(self, arcname):
+        if arcname in self.names:
+            return False
+        self.names.add(arcname)
+        return True
+
+    def add_file(self, path, arcname):
+        """Agrega un archivo ya escrito (descargado o materializado desde el PdfStore)"""
+        with self._lock:
+            if not self._claim(arcname):
+                return
+            self._zip.write(path, arcname)
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _new_download_stats(total):
+    return {
+        "total": total, "downloaded": 0, "failed": 0, "no_pdf": 0,
+        "resolution_cache_hits": 0, "resolution_cache_misses": 0, "store_hits": 0,
+        "journal_hits": 0, "log": [], "errors": [],
+    }
+
+def _record_download_outcome(stats, entry, errors):
+    """Acumula en `stats` el resultado de un DOI (entrada de log + errores)"""
+    status = entry.get("status")
+    if status == "downloaded":
+        stats["downloaded"] += 1
+    elif status == "no_pdf":
+        stats["no_pdf"] += 1
+    else:
+        stats["failed"] += 1
+    if entry.get("store") == "hit":
+        stats["store_hits"] += 1
+    if entry.get("journal") == "hit":
+        stats["journal_hits"] += 1
+    cache_state = entry.get("resolution_cache")
+    if cache_state == "hit":
+        stats["resolution_cache_hits"] += 1
+    elif cache_state == "miss":
+        stats["resolution_cache_misses"] += 1
+    stats["errors"].extend(errors)
+    stats["log"].append(entry)
+
+def _no_pdf_entry(make_entry, flow_log, cache_state):
+    """Entrada "no_pdf"; transient=True si la causa fue una falla de red que conviene reintentar"""
+    if cache_state != "hit" and not _is_definitive_miss(flow_log):
+        return make_entry(status="no_pdf", transient=True)
+    return make_entry(status="no_pdf")
+
+def _is_definitive_miss(flow_log):
+    """
+    True si la resolución terminó sin PDF por contenido (landing accesible y
+    ningún error de red), no por una falla transitoria que convenga reintentar
+    """
+    steps = flow_log.get("steps", [])
+    if any("error" in step or _is_transient_status(step.get("status")) for step in steps):
+        return False
+    statuses = [step.get("status") for step in steps if step.get("phase") in ("landing", "article_page")]
+    return bool(statuses) and isinstance(statuses[-1], int) and 200 <= statuses[-1] < 300
+
+def _is_transient_status(status):
+    """HTTP que indica sobrecarga o límite del servidor, no ausencia del PDF"""
+    return isinstance(status, int) and (status in (408, 425, 429) or status >= 500)
+
+def _doi_prefix(doi):
+    doi_norm = (doi or "").replace("https://doi.org/", "").replace("http://doi.org/", "").strip().lower()
+    return doi_norm.split("/", 1)[0]
+
+def _interleave_by_prefix(jobs):
+    """
+    Reordena [(idx, doi), ...] alternando prefijos DOI (10.xxxx ~ editorial)
+    para repartir la carga entre dominios en lugar de concentrarla en uno
+    """
+    groups = {}
+    for job in jobs:
+        groups.setdefault(_doi_prefix(job[1]), []).append(job)
+    queues = list(groups.values())
+    out = []
+    while queues:
+        for q in queues:
+            out.append(q.pop(0))
+        queues = [q for q in queues if q]
+    return out
+
+# Tamaño de bloque al leer PDFs (el primero sirve para validar la firma)
+PDF_CHUNK_SIZE = 65536
+
+# Sondeo escalonado (hedging) de candidatos a PDF dentro de un DOI: el
+# siguiente candidato arranca tras HEDGE_STAGGER segundos sin respuesta (o
+# apenas falla el anterior), con hasta HEDGE_MAX_PARALLEL en vuelo
+HEDGE_STAGGER = 0.5
+HEDGE_MAX_PARALLEL = 4
+# Si responde un candidato de menor prioridad, los anteriores todavía en
+# vuelo tienen este margen antes de darse por perdidos (no esperar el timeout)
+HEDGE_GRACE = 2.0
+# Un sondeo lanzado puede esperar lugar en su dominio: el escalonamiento
+# cuenta desde que arranca de verdad, y mientras tanto se revisa cada tanto
+HEDGE_START_POLL = 0.05
+
+def _probe_step(candidate, ok, fin, detail, stage, started, elapsed):
+    """Paso del flow log para un candidato sondeado dentro de una carrera"""
+    return {
+        "phase": candidate["phase"], "url": candidate["url"], "ok": bool(ok), "final_url": fin or "",
+        **detail,
+        "race": stage, "started_ms": int(started * 1000), "elapsed_ms": int(elapsed * 1000),
+    }
+
+def _race_step(stage, candidates, launched, winner, cancelled):
+    """Resumen de una carrera: qué se lanzó, qué ganó y qué se canceló"""
+    return {
+        "phase": "race", "stage": stage, "candidates": len(candidates), "launched": launched,
+        "winner": candidates[winner]["url"] if winner is not None else "",
+        "winner_method": candidates[winner]["method"] if winner is not None else "",
+        "cancelled": cancelled,
+        "not_started": [c["url"] for c in candidates[launched:]],
+    }
+
+def _close_probe(fut):
+    """Cierra la respuesta de un sondeo que terminó después de decidida la carrera"""
+    if fut.cancelled():
+        return
+    try:
+        ok, _, pdf, _ = fut.result()
+    except Exception:
+        return
+    if ok and pdf is not None:
+        pdf.close()
+
+class _OpenPdfResponse:
+    """Respuesta PDF abierta (stream) cuyo primer bloque ya se leyó para validar la firma"""
+
+    def __init__(self, response, first, rest):
+        self.response = response
+        self.headers = response.headers
+        self.url = response.url
+        self.first = first
+        self.rest = rest
+
+    def iter_content(self):
+        if self.first:
+            yield self.first
+        for chunk in self.rest:
+            yield chunk
+
+    def close(self):
+        self.response.close()
+
+class ColumnarResults:
+    """
+    Resultados acumulados directamente en columnas
+
+    Cada página de obras se vuelca en listas por columna (citas y acceso
+    abierto en arrays tipados) sin construir un dict por fila; al final se
+    arma un DataFrame (o una tabla Arrow) con las mismas columnas que
+    get_all_results + search_query.
+    """
+
+    def __init__(self, searcher, query=""):
+        self._extract = searcher._extract_values
+        self.query = (query or "").strip()
+        self.columns = {name: [] for name in ROW_COLUMNS}
+        self.columns["citations"] = array("q")
+        self.columns["open_access"] = array("b")
+        citations = self.columns["citations"].append
+        open_access = self.columns["open_access"].append
+        appenders = {name: self.columns[name].append for name in ROW_COLUMNS}
+        appenders["citations"] = lambda v: citations(int(v or 0))
+        appenders["open_access"] = lambda v: open_access(1 if v else 0)
+        self._appenders = [appenders[name] for name in ROW_COLUMNS]
+
+    def __len__(self):
+        return len(self.columns["openalex_id"])
+
+    def append_works(self, works):
+        extract = self._extract
+        appenders = self._appenders
+        for w in works:
+            for append, value in zip(appenders, extract(w)):
+                append(value)
+
+    def _column_data(self):
+        import numpy as np
+        data = {}
+        for name in ROW_COLUMNS:
+            col = self.columns[name]
+            if name == "citations":
+                data[name] = np.frombuffer(col, dtype=np.int64).copy() if len(col) else np.zeros(0, dtype=np.int64)
+            elif name == "open_access":
+                data[name] = np.frombuffer(col, dtype=np.int8).astype(bool) if len(col) else np.zeros(0, dtype=bool)
+            else:
+                data[name] = col
+        data["search_query"] = [self.query] * len(self)
+        return data
+
+    def to_frame(self, columns=None):
+        """DataFrame con todas las columnas, o solo `columns` (p. ej. para una vista previa)"""
+        import pandas as pd
+        return pd.DataFrame(self._column_data(), columns=list(columns or ROW_COLUMNS + ("search_query",)))
+
+    def to_arrow(self):
+        """Tabla pyarrow (requiere pyarrow instalado)"""
+        import pyarrow as pa
+        data = self._column_data()
+        # year mezcla enteros y "" (sin año): Arrow necesita un tipo único
+        data["year"] = [y if y != "" else None for y in data["year"]]
+        return pa.table(data)
+
 class OpenAlexSearcher:
-    def __init__(self, timeout=25, mailto=None):
+    def __init__(self, timeout=25, mailto=None, scheduler=None, cache=None, resolution_cache=None, pdf_store=None, rate_limiter=None, session=None):
+        """
+        Args:
+            timeout: Timeout (segundos) de cada request
+            mailto: Email para el polite pool de OpenAlex
+            scheduler: HostScheduler para requests a editoriales (compartido por defecto)
+            cache: ResponseCache opcional para respuestas de la API (ver openalex_cache.py)
+            resolution_cache: ResolutionCache opcional DOI → URL del PDF (ver openalex_cache.py)
+            pdf_store: PdfStore opcional; se consulta antes de cualquier acceso a la red
+            rate_limiter: OpenAlexRateLimiter para la API (por defecto, uno
+                          compartido por todo el proceso; ver openalex_ratelimit.py)
+            session: requests.Session a usar (por defecto, una propia del
+                     searcher sobre el pool compartido; ver new_session)
+        """
         self.timeout = timeout
         self.mailto = mailto or os.getenv("OPENALEX_MAILTO")
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "OpenAlex-Streamlit/1.4 (+mailto)",
-            "Accept": "application/json",
-            "Accept-Language": "en-US,en;q=0.8",
-        })
+        self.scheduler = scheduler or _get_default_scheduler()
+        self.cache = cache
+        self.resolution_cache = resolution_cache
+        self.pdf_store = pdf_store
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self.session = session or self._new_session()
+
+    def _new_session(self):
+        return new_session()
+
+    def _polite(self, method, url, **kwargs):
+        """GET/HEAD hacia editoriales pasando por el scheduler por dominio"""
+        return self.scheduler.request(self.session, method, url, **kwargs)
+
+    def _cached_response(self, params):
+        """Respuesta guardada en la caché para `params` (None si no hay)"""
+        if self.cache is None:
+            return None
+        return self.cache.get({k: v for k, v in params.items() if v not in (None, "")})
 
     def _request(self, params):
         p = {k: v for k, v in params.items() if v not in (None, "")}
+        cached = self._cached_response(p)
+        if cached is not None:
+            return cached
+        key_params = dict(p)
         if self.mailto:
             p["mailto"] = self.mailto
         url = f"{OPENALEX_BASE}?{urlencode(p, doseq=True)}"
 
-        for delay in (0, 1.0, 2.0):
-            if delay:
-                time.sleep(delay)
-            r = self.session.get(url, timeout=self.timeout)
+        limiter = self.rate_limiter
+        for attempt in range(API_MAX_ATTEMPTS):
+            limiter.acquire()
+            t0 = time.monotonic()
+            try:
+                r = self.session.get(url, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == API_MAX_ATTEMPTS - 1:
+                    raise
+                time.sleep(limiter.backoff(attempt))
+                continue
+            limiter.update_from_headers(r.headers)
             if r.status_code == 200:
-                return r.json()
+                data = _loads(r.content)
+                if int(p.get("per_page", 0)) > 1 and "group_by" not in p:
+                    _page_latency.record(time.monotonic() - t0)
+                if self.cache is not None:
+                    self.cache.put(key_params, data)
+                return data
             if r.status_code in (403, 429):
-                ra = r.headers.get("Retry-After")
-                if ra:
-                    try:
-                        time.sleep(float(ra))
-                    except Exception:
-                        time.sleep(2.0)
+                # Límite de OpenAlex: frena a todo el proceso; acquire() espera
+                limiter.backoff(attempt, r.headers.get("Retry-After"), throttled=True)
+                continue
+            if r.status_code >= 500:
+                time.sleep(limiter.backoff(attempt, r.headers.get("Retry-After")))
                 continue
             r.raise_for_status()
+        if r.status_code in (403, 429):
+            raise OpenAlexRateLimitError(
+                f"OpenAlex sigue limitando los requests (HTTP {r.status_code}) "
+                f"después de {API_MAX_ATTEMPTS} intentos; pruebe de nuevo en unos minutos"
+            )
         r.raise_for_status()
 
     def _reconstruct_abstract(self, inverted):
         if not inverted:
             return ""
         try:
-            max_pos = 0
+            # Las posiciones suelen ser 0..n-1: se reserva la lista una sola vez
+            # con n = total de apariciones y se llena en una pasada
+            size = 0
             for positions in inverted.values():
-                max_pos = max(max_pos, max(positions))
-            words = [""] * (max_pos + 1)
+                size += len(positions)
+            words = [""] * size
             for w, poss in inverted.items():
                 for p in poss:
-                    if 0 <= p < len(words):
+                    if p >= size:
+                        return self._reconstruct_abstract_sparse(inverted)
+                    if p >= 0:
                         words[p] = w
             return " ".join([w for w in words if w])
         except Exception:
             return ""
 
-    def _extract_row(self, w):
+    def _reconstruct_abstract_sparse(self, inverted):
+        # Posiciones con huecos: dimensionar por la posición máxima
+        max_pos = 0
+        for positions in inverted.values():
+            max_pos = max(max_pos, max(positions))
+        words = [""] * (max_pos + 1)
+        for w, poss in inverted.items():
+            for p in poss:
+                if 0 <= p < len(words):
+                    words[p] = w
+        return " ".join([w for w in words if w])
+
+    def _extract_values(self, w):
+        """Valores de una obra en el orden de ROW_COLUMNS (sin armar un dict)"""
         doi = (w.get("doi") or "").replace("https://doi.org/", "").replace("http://doi.org/", "")
         oa = w.get("open_access") or {}
         is_oa = bool(oa.get("is_oa")) if isinstance(oa, dict) else bool(oa)
@@ -226,35 +908,51 @@ class OpenAlexSearcher:
         if isinstance(prim, dict):
             src = prim.get("source") or {}
             pub = src.get("display_name") or ""
-        abstract = self._reconstruct_abstract(w.get("abstract_inverted_index"))
+        # None = abstract no pedido (perfil sin abstracts); "" = la obra no tiene
+        abstract = self._reconstruct_abstract(w.get("abstract_inverted_index")) if "abstract_inverted_index" in w else None
         best = w.get("best_oa_location") or {}
         pdf_url = best.get("pdf_url") or (prim.get("pdf_url") if isinstance(prim, dict) else None)
         landing_url = best.get("landing_page_url") or (prim.get("landing_page_url") if isinstance(prim, dict) else None)
-        return {
-            "title": w.get("display_name", ""),
-            "author": "; ".join(authors),
-            "publication": pub,
-            "year": w.get("publication_year") or "",
-            "citations": w.get("cited_by_count", 0),
-            "doi": doi,
-            "openalex_id": w.get("id", ""),
-            "open_access": is_oa,
-            "abstract": abstract,
-            "oa_pdf_url": pdf_url or "",
-            "oa_landing_url": landing_url or "",
-        }
+        return (
+            w.get("display_name", ""),
+            "; ".join(authors),
+            pub,
+            w.get("publication_year") or "",
+            w.get("cited_by_count", 0),
+            doi,
+            w.get("id", ""),
+            is_oa,
+            abstract,
+            pdf_url or "",
+            landing_url or "",
+            _location_pdf_urls(w),
+        )
+
+    def _extract_row(self, w):
+        return dict(zip(ROW_COLUMNS, self._extract_values(w)))
+
+    def _build_search_params(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", sort_by="relevance_score:desc"):
+        """
+        Parámetros de /works para una búsqueda (sin cursor ni mailto)
 
-    def get_all_results(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None):
+        Raises:
+            QueryError: Si la consulta está mal formada (antes de tocar la red)
+        """
+        compiled = compile_query(query)
+        field = search_field_for(search_type)
         params = {
             "per_page": min(max_results, 200),
-            "select": SELECT_FIELDS,
-            "sort": "relevance_score:desc",
-            "cursor": "*",
-            "search": query.strip(),
+            "select": _select_for(profile),
+            "sort": sort_by or "relevance_score:desc",
         }
 
         # Construir filtros
         filters = []
+        if field:
+            # Búsqueda acotada al campo (título o título + abstract)
+            filters.append(f"{field}:{compiled}")
+        else:
+            params["search"] = compiled
         if open_access_filter == "open_access_only":
             filters.append("is_oa:true")
         elif open_access_filter == "closed_only":
@@ -271,174 +969,453 @@ class OpenAlexSearcher:
         # Unir filtros con coma (AND en OpenAlex)
         if filters:
             params["filter"] = ",".join(filters)
-        out = []
-        while len(out) < max_results:
-            data = self._request(params)
-            batch = data.get("results", []) or []
-            out.extend(batch)
-            cur = data.get("meta", {}).get("next_cursor")
-            if not cur or not batch:
-                break
-            params["cursor"] = cur
-        rows = [self._extract_row(w) for w in out[:max_results]]
+        return params
+
+    def _finalize_rows(self, works, query):
+        rows = [self._extract_row(w) for w in works]
         sq = query.strip()
         for r in rows:
             r.setdefault("search_query", sq)
         return rows
 
-    def _find_meta_pdf_url(self, html_bytes, base_url):
-        soup = BeautifulSoup(html_bytes, "html.parser")
-
-        # Lista extendida de meta tags que pueden contener URL del PDF
-        meta_names = [
-            "citation_pdf_url",
-            "pdf_url",
-            "og:pdf",
-            "dc.identifier.uri",
-            "dc.relation.uri",
-            "bepress_citation_pdf_url",
-            "fulltext_pdf"
-        ]
+    def _iter_work_pages(self, params, max_results, parallel_pages=False):
+        """
+        Recorre la búsqueda y produce lotes de obras crudas (hasta max_results)
 
-        # Buscar en meta tags
-        for m in soup.find_all("meta"):
-            name = (m.get("name") or m.get("property") or "").lower()
-            content = (m.get("content") or "").strip()
+        Con parallel_pages=True, la primera página (cursor="*") trae
+        meta.count; si el total cabe en PAGE_WINDOW, las páginas restantes se
+        piden en paralelo como page=2..N y se devuelven en orden, con el mismo
+        resultado que el recorrido por cursor.
+        """
+        params = dict(params, cursor="*")
+        if parallel_pages:
+            data = self._request(params)
+            first = (data.get("results", []) or [])[:max_results]
+            if first:
+                yield first
+            meta = data.get("meta", {})
+            per_page = params["per_page"]
+            total = min(meta.get("count") or 0, max_results)
+            if not first or len(first) >= total:
+                return
+            if total <= PAGE_WINDOW:
+                yield from self._fetch_numbered_pages(params, 2, -(-total // per_page), total - len(first))
+                return
+            # Fuera de la ventana numerada: seguir con el cursor
+            fetched = len(first)
+            cur = meta.get("next_cursor")
+            if not cur:
+                return
+            params["cursor"] = cur
+        else:
+            fetched = 0
+        while fetched < max_results:
+            data = self._request(params)
+            batch = (data.get("results", []) or [])[:max_results - fetched]
+            if batch:
+                yield batch
+            fetched += len(batch)
+            cur = data.get("meta", {}).get("next_cursor")
+            if not cur or not batch:
+                break
+            params["cursor"] = cur
 
-            if not content:
-                continue
+    def _fetch_numbered_pages(self, params, first_page, last_page, remaining):
+        """Pide page=first_page..last_page en paralelo y produce los lotes en orden"""
+        base = {k: v for k, v in params.items() if k != "cursor"}
 
-            # Verificar si el nombre del meta tag indica PDF
-            if name in meta_names:
-                return urljoin(base_url, content)
+        def _fetch(page):
+            return self._request(dict(base, page=page)).get("results", []) or []
 
-            # Verificar si el contenido parece ser una URL de PDF
-            if name and "pdf" in name and (content.lower().endswith(".pdf") or "/pdf" in content.lower()):
-                return urljoin(base_url, content)
+        pages = range(first_page, last_page + 1)
+        with ThreadPoolExecutor(max_workers=max(1, min(PAGE_FETCH_WORKERS, len(pages)))) as pool:
+            for batch in pool.map(_fetch, pages):
+                batch = batch[:remaining]
+                if not batch:
+                    break
+                yield batch
+                remaining -= len(batch)
 
-        # Buscar en link tags con type="application/pdf"
-        for l in soup.find_all("link", href=True):
-            rel = l.get("rel", [])
-            if isinstance(rel, str):
-                rel = [rel]
-            typ = (l.get("type") or "").lower()
-            title = (l.get("title") or "").lower()
-            href = (l.get("href") or "").strip()
+    def get_all_results(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        """
+        Busca obras en OpenAlex
 
-            if not href:
-                continue
+        Args:
+            profile: Campos a pedir (ver SELECT_PROFILES): "table" (sin
+                     abstracts), "abstracts", "download" (con locations) o "full"
+            parallel_pages: Pedir las páginas en paralelo (ver _iter_work_pages)
+            sort_by: Orden de OpenAlex (ej. "cited_by_count:desc")
 
-            # Link con type PDF
-            if "application/pdf" in typ:
-                return urljoin(base_url, href)
+        Raises:
+            QueryError: Consulta mal formada (ver openalex_query.compile_query)
+        """
+        out = []
+        for rows in self.iter_results(query, max_results, search_type, open_access_filter, year_from, year_to, profile, parallel_pages, sort_by):
+            out.extend(rows)
+        return out
 
-            # Link alternativo que apunta a PDF
-            if "alternate" in rel and (".pdf" in href.lower() or "pdf" in title):
-                return urljoin(base_url, href)
+    def iter_results(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        """
+        Igual que get_all_results, pero produce las filas página por página
+        a medida que llegan (la primera tras un solo request)
 
-        return None
+        Yields:
+            Listas de filas con el formato de get_all_results
+        """
+        params = self._build_search_params(query, max_results, search_type, open_access_filter, year_from, year_to, profile, sort_by)
+        for batch in self._iter_work_pages(params, max_results, parallel_pages):
+            yield self._finalize_rows(batch, query)
 
-    def _find_view_link(self, html_bytes, base_url):
-        soup = BeautifulSoup(html_bytes, "html.parser")
+    def get_all_results_frame(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        """
+        Igual que get_all_results, pero devuelve un DataFrame armado por columnas
+        (sin un dict intermedio por fila). Ver ColumnarResults.
+        """
+        cols = ColumnarResults(self, query)
+        for cols in self.iter_results_columns(query, max_results, search_type, open_access_filter, year_from, year_to, profile, parallel_pages, sort_by):
+            pass
+        return cols.to_frame()
 
-        view_patterns = [
-            "view", "/article/view", "/viewarticle",
-            "fulltext", "full-text", "full_text",
-            "/ver", "leer"
-        ]
+    def iter_results_columns(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, profile="full", parallel_pages=False, sort_by="relevance_score:desc"):
+        """
+        Como iter_results, pero vuelca cada página en un único ColumnarResults
 
-        # Buscar en enlaces <a>
-        for a in soup.find_all("a", href=True):
-            href = (a.get("href") or "").strip()
-            txt = (a.get_text() or "").strip().lower()
+        Yields:
+            El mismo ColumnarResults tras agregar cada página (to_frame()
+            arma la tabla acumulada hasta ese momento)
+        """
+        params = self._build_search_params(query, max_results, search_type, open_access_filter, year_from, year_to, profile, sort_by)
+        cols = ColumnarResults(self, query)
+        for batch in self._iter_work_pages(params, max_results, parallel_pages):
+            cols.append_works(batch)
+            yield cols
 
-            if not href:
-                continue
+    def preflight(self, query, max_results=50, search_type="general", open_access_filter="all", year_from=None, year_to=None, parallel_pages=True):
+        """
+        Cuenta los resultados con una página mínima (per_page=1, solo `id`)
+        y estima el costo de la búsqueda completa antes de hacerla
 
-            low_href = href.lower()
+        El tiempo estimado usa la latencia por página medida en las búsquedas
+        anteriores del proceso; si todavía no hay ninguna, la del propio
+        preflight (subestima: la página es mínima). Si el conteo sale de la
+        caché no hay latencia real que medir y se usa PREFLIGHT_DEFAULT_LATENCY.
 
-            # Verificar patrones en el href
-            if any(pattern in low_href for pattern in view_patterns):
-                return urljoin(base_url, href)
+        Returns:
+            {"count": total de resultados, "fetch": filas que se bajarían,
+             "pages": requests de páginas, "seconds": tiempo estimado,
+             "page_latency": segundos por página, "latency_measured": bool}
 
-            # Verificar si el texto indica visualización
-            if any(pattern in txt for pattern in view_patterns):
-                return urljoin(base_url, href)
+        Raises:
+            QueryError: Consulta mal formada (ver openalex_query.compile_query)
+        """
+        params, per_page = self._preflight_params(query, max_results, search_type, open_access_filter, year_from, year_to)
+        data = self._cached_response(params)
+        elapsed = None
+        if data is None:
+            t0 = time.monotonic()
+            data = self._request(params)
+            elapsed = time.monotonic() - t0
+        return self._preflight_estimate(data, elapsed, per_page, max_results, parallel_pages)
+
+    def _preflight_params(self, query, max_results, search_type, open_access_filter, year_from, year_to):
+        """Parámetros del request mínimo de preflight y per_page de la búsqueda real"""
+        params = self._build_search_params(query, max_results, search_type, open_access_filter, year_from, year_to)
+        per_page = params["per_page"]
+        params.update(per_page=1, select="id")
+        params.pop("sort", None)
+        return params, per_page
+
+    def _preflight_estimate(self, data, elapsed, per_page, max_results, parallel_pages):
+        """`elapsed`: duración del request de preflight, o None si salió de la caché"""
+        count = data.get("meta", {}).get("count") or 0
+        fetch = min(count, max_results)
+        pages = -(-fetch // per_page)
+        measured = _page_latency.estimate()
+        if measured is not None:
+            latency = measured
+        else:
+            latency = elapsed if elapsed is not None else PREFLIGHT_DEFAULT_LATENCY
+        if parallel_pages and 1 < pages and fetch <= PAGE_WINDOW:
+            # La primera página va sola; el resto, de a PAGE_FETCH_WORKERS
+            rounds = 1 + -(-(pages - 1) // PAGE_FETCH_WORKERS)
+        else:
+            rounds = pages
+        return {
+            "count": count,
+            "fetch": fetch,
+            "pages": pages,
+            "seconds": rounds * latency,
+            "page_latency": latency,
+            "latency_measured": measured is not None,
+        }
 
-        # Buscar en iframes, embeds y objects
-        for tag in soup.find_all(["iframe", "embed", "object"]):
-            src = tag.get("src") or tag.get("data")
-            if not src:
-                continue
+    def summarize(self, query, search_type="general", open_access_filter="all", year_from=None, year_to=None, top_n=10, max_workers=4):
+        """
+        Resumen del corpus completo de una búsqueda sin bajar las obras
 
-            low_src = src.lower()
-            if any(pattern in low_src for pattern in view_patterns):
-                return urljoin(base_url, src)
+        Hace un request `group_by` por faceta (ver SUMMARY_GROUPS), en
+        paralelo: los conteos cubren todos los resultados, no solo las filas
+        descargadas.
 
-        return None
+        Returns:
+            {"count": total de resultados,
+             "years": [(año, n), ...] ordenado por año,
+             "oa_status": [(estado, n), ...],
+             "venues": [(revista, n), ...] (top_n),
+             "institutions": [(institución, n), ...] (top_n)}
+
+        Raises:
+            QueryError: Consulta mal formada (ver openalex_query.compile_query)
+        """
+        params = self._summary_params(query, search_type, open_access_filter, year_from, year_to)
+
+        def _fetch(field):
+            return self._request(dict(params, group_by=field))
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            responses = dict(zip(SUMMARY_GROUPS, pool.map(_fetch, SUMMARY_GROUPS.values())))
+        return self._summary_from(responses, top_n)
+
+    def _summary_params(self, query, search_type, open_access_filter, year_from, year_to):
+        params = self._build_search_params(query, 1, search_type, open_access_filter, year_from, year_to)
+        for key in ("per_page", "select", "sort"):
+            params.pop(key, None)
+        return params
+
+    def _summary_from(self, responses, top_n):
+        """Arma el resumen a partir de {faceta: respuesta group_by}"""
+        summary = {"count": responses["years"].get("meta", {}).get("count") or 0}
+        for name, data in responses.items():
+            groups = [
+                (g.get("key_display_name") or g.get("key"), g.get("count") or 0)
+                for g in data.get("group_by", []) or []
+                if g.get("key") not in (None, "", "unknown")
+            ]
+            if name == "years":
+                groups = sorted((int(k), n) for k, n in groups if str(k).isdigit())
+            elif name in ("venues", "institutions"):
+                groups = sorted(groups, key=lambda kv: -kv[1])[:top_n]
+            summary[name] = groups
+        return summary
+
+    def get_works_by_dois(self, dois, chunk_size=DOI_CHUNK_SIZE, max_workers=4, profile="full"):
+        """
+        Obtiene metadatos para una lista de DOIs (p. ej. una colección de Zotero)
 
-    def _find_direct_pdf_links(self, html_bytes, base_url):
-        """Busca enlaces directos a PDFs en la página landing, priorizando el dominio actual"""
-        from urllib.parse import urlparse
-        soup = BeautifulSoup(html_bytes, "html.parser")
-        same_domain = []
-        other_domain = []
+        Agrupa los DOIs en filtros OR de OpenAlex (`doi:a|b|c`) de `chunk_size`
+        valores y pide los grupos en paralelo: miles de DOIs se resuelven en
+        unas pocas decenas de requests.
 
-        base_domain = urlparse(base_url).netloc
+        Args:
+            dois: Lista de DOIs (con o sin prefijo https://doi.org/)
+            chunk_size: DOIs por request (OpenAlex admite hasta 100 valores OR)
+            max_workers: Requests simultáneos
+            profile: Campos a pedir (ver SELECT_PROFILES)
 
-        pdf_patterns = [".pdf", "download", "descargar", "pdf", "galley", "/article/download"]
-        text_patterns = ["pdf", "download", "descargar", "texto completo", "full text", "ver pdf", "view pdf"]
+        Returns:
+            Lista de filas con el formato de _extract_row, en el orden de entrada
+            (los DOIs que OpenAlex no conoce se omiten)
+        """
+        wanted, chunks = self._doi_chunks(dois, chunk_size)
+
+        def _fetch(chunk):
+            return self._request(self._doi_chunk_params(chunk, profile)).get("results", []) or []
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            return self._rows_by_doi(wanted, pool.map(_fetch, chunks))
+
+    def _doi_chunks(self, dois, chunk_size):
+        """DOIs normalizados y sin repetir, y sus grupos para los filtros OR"""
+        wanted = []
+        for doi in dois:
+            d = _normalize_doi(doi)
+            # Coma y barra vertical son separadores en la sintaxis de filtros
+            if d and "," not in d and "|" not in d:
+                wanted.append(d)
+        wanted = _dedup(wanted)
+        chunk_size = max(1, min(chunk_size, 100))
+        return wanted, [wanted[i:i + chunk_size] for i in range(0, len(wanted), chunk_size)]
+
+    def _doi_chunk_params(self, chunk, profile):
+        # Hay obras distintas con el mismo DOI: un grupo (a lo sumo 100 DOIs)
+        # puede devolver más resultados que DOIs; con el máximo de OpenAlex
+        # (200) entran sin paginar
+        return {
+            "filter": "doi:" + "|".join(chunk),
+            "per_page": 200,
+            "select": _select_for(profile),
+        }
 
-        for a in soup.find_all("a", href=True):
-            href = (a.get("href") or "").strip()
-            txt = (a.get_text() or "").strip().lower()
-            css_classes = " ".join(a.get("class", [])).lower()
+    def _rows_by_doi(self, wanted, batches):
+        """Filas de las obras de `batches` en el orden de `wanted`"""
+        by_doi = {}
+        for batch in batches:
+            for w in batch:
+                by_doi[_normalize_doi(w.get("doi"))] = w
+        works = [by_doi[d] for d in wanted if d in by_doi]
+        return self._finalize_rows(works, "lista de DOIs")
 
-            if not href:
-                continue
+    def fetch_abstracts(self, openalex_ids, chunk_size=DOI_CHUNK_SIZE, max_workers=4):
+        """
+        Trae solo los abstracts de las obras indicadas (carga diferida)
 
-            low_href = href.lower()
-            full_url = urljoin(base_url, href)
-            url_domain = urlparse(full_url).netloc
+        Args:
+            openalex_ids: IDs de OpenAlex (https://openalex.org/W123 o W123)
+            max_workers: Requests simultáneos
 
-            # Determinar si este enlace es candidato a PDF
-            is_candidate = False
+        Returns:
+            Diccionario {openalex_id tal como se pasó: abstract ("" si no tiene)}
+        """
+        short, chunks = self._abstract_chunks(openalex_ids, chunk_size)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            return self._abstracts_from(short, pool.map(self._request, chunks))
+
+    def _abstract_chunks(self, openalex_ids, chunk_size):
+        """{ID corto: [IDs tal como se pasaron]} y los parámetros de cada request"""
+        short = {}
+        for oid in openalex_ids:
+            if oid:
+                short.setdefault(str(oid).rstrip("/").rsplit("/", 1)[-1].upper(), []).append(oid)
+        keys = list(short)
+        chunks = []
+        for i in range(0, len(keys), chunk_size):
+            chunk = keys[i:i + chunk_size]
+            chunks.append({
+                "filter": "openalex:" + "|".join(chunk),
+                "per_page": len(chunk),
+                "select": "id,abstract_inverted_index",
+            })
+        return short, chunks
+
+    def _abstracts_from(self, short, responses):
+        out = {}
+        for data in responses:
+            for w in data.get("results", []) or []:
+                wid = (w.get("id") or "").rsplit("/", 1)[-1].upper()
+                for original in short.get(wid, []):
+                    out[original] = self._reconstruct_abstract(w.get("abstract_inverted_index"))
+        for originals in short.values():
+            for original in originals:
+                out.setdefault(original, "")
+        return out
+
+    def _analyze_landing(self, html_bytes, base_url):
+        """
+        Analiza la página landing en una sola pasada
 
-            # Enlaces que terminan en .pdf
-            if low_href.endswith(".pdf"):
-                is_candidate = True
+        Recorre una única vez los tags relevantes (meta, link, a, iframe,
+        embed, object) y aplica a la vez las heurísticas de meta PDF, enlaces
+        directos y enlace de visualización.
+
+        Returns:
+            {"meta_pdf": url|None, "direct_links": [urls], "view_url": url|None}
+        """
+        soup = _parse_html(html_bytes)
+        base_domain = urlparse(base_url).netloc
 
-            # Enlaces OJS con class="pdf" o class="obj_galley_link"
-            elif "pdf" in css_classes or "galley" in css_classes:
-                is_candidate = True
+        meta_from_meta = None
+        meta_from_link = None
+        view_from_a = None
+        view_from_embed = None
+        same_domain = []
+        other_domain = []
 
-            # Enlaces con patrones de descarga
-            elif any(pattern in low_href for pattern in pdf_patterns):
-                # Verificar que también el texto o clases sugieran descarga/PDF
-                if any(pattern in txt for pattern in text_patterns) or any(pattern in css_classes for pattern in ["pdf", "download", "galley"]) or any(pattern in low_href for pattern in [".pdf", "download", "galley"]):
+        for tag in soup.find_all(_LANDING_TAGS):
+            name = tag.name
+
+            if name == "meta":
+                if meta_from_meta is not None:
+                    continue
+                meta_name = (tag.get("name") or tag.get("property") or "").lower()
+                content = (tag.get("content") or "").strip()
+                if not content:
+                    continue
+                # Verificar si el nombre del meta tag indica PDF
+                if meta_name in _META_PDF_NAMES:
+                    meta_from_meta = urljoin(base_url, content)
+                # Verificar si el contenido parece ser una URL de PDF
+                elif meta_name and "pdf" in meta_name and (content.lower().endswith(".pdf") or "/pdf" in content.lower()):
+                    meta_from_meta = urljoin(base_url, content)
+
+            elif name == "link":
+                if meta_from_link is not None:
+                    continue
+                href = (tag.get("href") or "").strip()
+                if not href:
+                    continue
+                rel = tag.get("rel", [])
+                if isinstance(rel, str):
+                    rel = [rel]
+                typ = (tag.get("type") or "").lower()
+                title = (tag.get("title") or "").lower()
+                # Link con type PDF o alternativo que apunta a PDF
+                if "application/pdf" in typ or ("alternate" in rel and (".pdf" in href.lower() or "pdf" in title)):
+                    meta_from_link = urljoin(base_url, href)
+
+            elif name == "a":
+                href = (tag.get("href") or "").strip()
+                if not href:
+                    continue
+                txt = (tag.get_text() or "").strip().lower()
+                low_href = href.lower()
+                full_url = urljoin(base_url, href)
+
+                # Enlace de visualización (patrón en href o texto)
+                if view_from_a is None:
+                    if any(p in low_href for p in _VIEW_PATTERNS) or any(p in txt for p in _VIEW_PATTERNS):
+                        view_from_a = full_url
+
+                # Enlace directo a PDF
+                css_classes = " ".join(tag.get("class", [])).lower()
+                is_candidate = False
+                # Enlaces que terminan en .pdf
+                if low_href.endswith(".pdf"):
                     is_candidate = True
+                # Enlaces OJS con class="pdf" o class="obj_galley_link"
+                elif "pdf" in css_classes or "galley" in css_classes:
+                    is_candidate = True
+                # Enlaces con patrones de descarga
+                elif any(p in low_href for p in _DIRECT_HREF_PATTERNS):
+                    # Verificar que también el texto o clases sugieran descarga/PDF
+                    if any(p in txt for p in _DIRECT_TEXT_PATTERNS) or any(p in css_classes for p in ["pdf", "download", "galley"]) or any(p in low_href for p in [".pdf", "download", "galley"]):
+                        is_candidate = True
+
+                if is_candidate:
+                    # Separar por dominio
+                    if urlparse(full_url).netloc == base_domain:
+                        same_domain.append(full_url)
+                    else:
+                        other_domain.append(full_url)
 
-            if is_candidate:
-                # Separar por dominio
-                if url_domain == base_domain:
-                    same_domain.append(full_url)
-                else:
-                    other_domain.append(full_url)
+            else:
+                # iframes, embeds y objects
+                if view_from_embed is not None:
+                    continue
+                src = tag.get("src") or tag.get("data")
+                if src and any(p in src.lower() for p in _VIEW_PATTERNS):
+                    view_from_embed = urljoin(base_url, src)
+
+        return {
+            # Los meta tags tienen prioridad sobre <link>
+            "meta_pdf": meta_from_meta or meta_from_link,
+            # Priorizar: mismo dominio primero, luego otros dominios
+            "direct_links": _dedup(same_domain) + _dedup(other_domain),
+            # Los enlaces <a> tienen prioridad sobre iframes/embeds
+            "view_url": view_from_a or view_from_embed,
+        }
+
+    def _find_meta_pdf_url(self, html_bytes, base_url):
+        return self._analyze_landing(html_bytes, base_url)["meta_pdf"]
 
-        # Deduplicar preservando orden
-        def dedup(lst):
-            seen, result = set(), []
-            for item in lst:
-                if item not in seen:
-                    seen.add(item)
-                    result.append(item)
-            return result
+    def _find_view_link(self, html_bytes, base_url):
+        return self._analyze_landing(html_bytes, base_url)["view_url"]
 
-        # Priorizar: mismo dominio primero, luego otros dominios
-        return dedup(same_domain) + dedup(other_domain)
+    def _find_direct_pdf_links(self, html_bytes, base_url):
+        """Busca enlaces directos a PDFs en la página landing, priorizando el dominio actual"""
+        return self._analyze_landing(html_bytes, base_url)["direct_links"]
 
     def _extract_download_links_from_view(self, html_bytes, base_url):
-        soup = BeautifulSoup(html_bytes, "html.parser")
+        soup = _parse_html(html_bytes)
         out = []
 
         # Patrones que indican un enlace de descarga
@@ -489,14 +1466,21 @@ class OpenAlexSearcher:
                     out.append(urljoin(base_url, src))
 
         # Deduplicar manteniendo el orden
-        seen, dedup = set(), []
-        for u in out:
-            if u not in seen:
-                seen.add(u)
-                dedup.append(u)
-        return dedup
-
-    def _try_get_pdf(self, url, referer=None, stream=False):
+        return _dedup(out)
+
+    def _try_get_pdf(self, url, referer=None, cancel=None, on_start=None):
+        """
+        GET en streaming: confirma PDF (Content-Type o firma %PDF) leyendo solo
+        el primer bloque y deja la respuesta abierta para escribirla
+
+        `cancel` y `on_start` van a HostScheduler.request (ver _race_candidates)
+
+        Returns:
+            (ok, final_url, pdf, detail) — si ok, `pdf` es un _OpenPdfResponse
+            que el caller debe cerrar; así cada PDF se transfiere una sola vez.
+            `detail` es {"status": código HTTP} o {"error": excepción} para el
+            flow log (ver _is_definitive_miss)
+        """
         headers = {
             "User-Agent": self.session.headers.get("User-Agent", "Mozilla/5.0"),
             "Accept": "application/pdf,application/octet-stream;q=0.9,*/*;q=0.8",
@@ -505,58 +1489,191 @@ class OpenAlexSearcher:
         if referer:
             headers["Referer"] = referer
 
-        # Intenta HEAD request primero (más rápido)
+        r = None
         try:
-            r = self.session.head(url, timeout=self.timeout, allow_redirects=True, headers=headers)
+            r = self._polite("get", url, timeout=self.timeout, allow_redirects=True, headers=headers, stream=True, cancel=cancel, on_start=on_start)
+            detail = {"status": r.status_code}
+            if not r.ok:
+                r.close()
+                return False, None, None, detail
+            chunks = r.iter_content(chunk_size=PDF_CHUNK_SIZE)
+            first = next(chunks, b"")
             ct = (r.headers.get("content-type") or "").lower()
-            if "application/pdf" in ct:
-                return True, r.url, None
-        except Exception:
-            pass
+            if "application/pdf" in ct or first.startswith(b"%PDF"):
+                return True, r.url, _OpenPdfResponse(r, first, chunks), detail
+            r.close()
+            return False, None, None, detail
+        except Exception as e:
+            if r is not None:
+                r.close()
+            return False, None, None, {"error": str(e)}
 
-        # GET request - verificar por content-type Y firma PDF
-        try:
-            r = self.session.get(url, timeout=self.timeout, allow_redirects=True, headers=headers, stream=stream)
-            if not r.ok:
-                return False, None, None
+    def _landing_candidates(self, page, base, log):
+        """
+        Candidatos a PDF de la landing en orden de prioridad: meta tag PDF y
+        enlaces directos (en OJS, /download/ antes que /view/)
+        """
+        candidates = []
+        meta_pdf = page["meta_pdf"]
+        log["steps"].append({"phase": "meta_lookup", "meta_pdf": meta_pdf or ""})
+        if meta_pdf:
+            candidates.append({"url": meta_pdf, "method": "meta_pdf", "referer": base, "phase": "meta_try"})
 
-            ct = (r.headers.get("content-type") or "").lower()
+        direct_links = page["direct_links"]
+        log["steps"].append({"phase": "direct_links_lookup", "count": len(direct_links), "links": direct_links})
+        for dlink in direct_links:
+            # Patrón OJS: convertir /article/view/ID/GALLEY a /article/download/ID/GALLEY
+            if "/article/view/" in dlink.lower():
+                converted = dlink.replace("/article/view/", "/article/download/").replace("/Article/View/", "/Article/Download/")
+                log["steps"].append({"phase": "ojs_view_to_download", "original": dlink, "converted": converted})
+                candidates.append({"url": converted, "method": "direct_link_ojs", "referer": base, "phase": "direct_link_try"})
+            candidates.append({"url": dlink, "method": "direct_link", "referer": base, "phase": "direct_link_try"})
+
+        seen = set()
+        return [c for c in candidates if not (c["url"] in seen or seen.add(c["url"]))]
+
+    def _location_candidates(self, pdf_urls, log, tried):
+        """Candidatos a partir de las URLs de PDF de las `locations` de OpenAlex"""
+        candidates = []
+        for url in pdf_urls:
+            if url not in tried:
+                tried.add(url)
+                candidates.append({"url": url, "method": "oa_location", "referer": None, "phase": "location_try"})
+        log["steps"].append({"phase": "location_lookup", "count": len(candidates), "urls": [c["url"] for c in candidates]})
+        return candidates
+
+    def _plugin_candidates(self, matches, referer, log, tried):
+        """
+        Candidatos de los plugins de openalex_resolvers, en orden de registro
 
-            # Si el content-type indica PDF, es PDF
-            if "application/pdf" in ct:
-                return True, r.url, r
+        Las URLs quedan en `tried` para que el scraping no las vuelva a sondear.
+        """
+        candidates = []
+        for name, urls in matches:
+            for url in urls:
+                if url not in tried:
+                    tried.add(url)
+                    candidates.append({"url": url, "method": f"plugin_{name}", "referer": referer, "phase": "plugin_try", "plugin": name})
+        log["steps"].append({"phase": "plugin_lookup", "plugins": [name for name, _ in matches], "count": len(candidates)})
+        return candidates
+
+    def _record_plugins(self, matches, winner, log):
+        """
+        Anota en el flow log el resultado de cada plugin y su tasa de aciertos
+        acumulada; los de menor prioridad que el ganador no llegaron a probarse
+        """
+        won = winner["plugin"] if winner else None
+        for name, _ in matches:
+            rate = record_plugin(name, name == won)
+            log["steps"].append({"phase": "plugin_result", "plugin": name, "hit": name == won, "hit_rate": round(rate, 3)})
+            if name == won:
+                break
 
-            # Si no hay stream, verificar firma mágica
-            if not stream:
-                if r.content.startswith(b"%PDF"):
-                    return True, r.url, r
-                return False, None, None
+    def _race_candidates(self, candidates, log, stage):
+        """
+        Sondea candidatos a PDF en paralelo escalonado, respetando su prioridad
+
+        El primer candidato arranca enseguida; cada uno de los siguientes
+        arranca cuando el anterior falla o tras HEDGE_STAGGER segundos sin
+        respuesta, contados desde que el anterior consiguió lugar en su
+        dominio. Gana el éxito de mayor prioridad: un candidato se acepta
+        cuando todos los anteriores fallaron o, si alguno sigue colgado,
+        tras HEDGE_GRACE segundos. Al decidirse la carrera los perdedores se
+        cancelan: los que esperan lugar lo abandonan sin hacer el request y
+        los que están en vuelo cierran su respuesta al llegar, así no demoran
+        la descarga del ganador en el mismo dominio.
 
-            # Con stream: leer solo los primeros bytes para verificar firma
-            # IMPORTANTE: usar peek() si está disponible, sino leer y conservar
-            try:
-                # Peek permite mirar sin consumir el stream
-                chunk = r.raw.peek(5)[:5] if hasattr(r.raw, 'peek') else None
-                if chunk and chunk.startswith(b"%PDF"):
-                    return True, r.url, r
-
-                # Si peek no está disponible, leer el chunk inicial
-                if chunk is None:
-                    first_chunk = next(r.iter_content(chunk_size=5), b"")
-                    if first_chunk.startswith(b"%PDF"):
-                        # Es un PDF pero ya consumimos bytes
-                        # Retornar None para que el caller haga una nueva petición
-                        r.close()
-                        return True, r.url, None
-            except Exception:
-                pass
+        Returns:
+            (candidato, final_url, pdf) del ganador, o (None, None, None)
+        """
+        if not candidates:
+            return None, None, None
+        n = len(candidates)
+        results = [None] * n
+        pending = {}
+        starts = [None] * n
+        cancel = threading.Event()
+        launched = 0
+        head = 0
+        winner = None
+        grace_start = None
+        t0 = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=min(HEDGE_MAX_PARALLEL, n))
+
+        def _started(i):
+            return lambda: starts.__setitem__(i, time.monotonic())
 
-            return False, None, None
+        try:
+            while head < n:
+                now = time.monotonic()
+                can_launch = launched < n and len(pending) < HEDGE_MAX_PARALLEL and grace_start is None
+                last_start = starts[launched - 1] if launched else None
+                if can_launch and (not pending or (last_start is not None and now - last_start >= HEDGE_STAGGER)):
+                    c = candidates[launched]
+                    fut = pool.submit(self._try_get_pdf, c["url"], c["referer"], cancel, _started(launched))
+                    pending[fut] = launched
+                    launched += 1
+                    continue
+                timeouts = []
+                if can_launch:
+                    timeouts.append(HEDGE_START_POLL if last_start is None else HEDGE_STAGGER - (now - last_start))
+                if grace_start is not None:
+                    timeouts.append(HEDGE_GRACE - (now - grace_start))
+                timeout = max(0.0, min(timeouts)) if timeouts else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    i = pending.pop(fut)
+                    try:
+                        results[i] = fut.result()
+                    except Exception as e:
+                        results[i] = (False, None, None, {"error": str(e)})
+                    ok, fin, _, detail = results[i]
+                    if starts[i] is None:
+                        starts[i] = time.monotonic()  # falló antes de conseguir lugar
+                    started = starts[i] - t0
+                    log["steps"].append(_probe_step(candidates[i], ok, fin, detail, stage, started, time.monotonic() - t0 - started))
+                while head < n and results[head] is not None and not results[head][0]:
+                    head += 1
+                if head < n and results[head] is not None:
+                    winner = head
+                    break
+                best = next((i for i in range(head + 1, n) if results[i] is not None and results[i][0]), None)
+                if best is not None:
+                    # Ya respondió uno de menor prioridad: los anteriores tienen HEDGE_GRACE s más
+                    if grace_start is None:
+                        grace_start = time.monotonic()
+                    elif time.monotonic() - grace_start >= HEDGE_GRACE:
+                        winner = best
+                        break
+        finally:
+            cancel.set()
+            for i, res in enumerate(results):
+                if res is not None and res[0] and i != winner:
+                    res[2].close()
+            cancelled = []
+            for fut, i in pending.items():
+                cancelled.append(candidates[i]["url"])
+                if not fut.cancel():
+                    fut.add_done_callback(_close_probe)
+            pool.shutdown(wait=False)
+            log["steps"].append(_race_step(stage, candidates, launched, winner, cancelled))
+
+        if winner is None:
+            return None, None, None
+        return candidates[winner], results[winner][1], results[winner][2]
+
+    def _resolve_pdf_with_logs(self, doi, debug=True, debug_dir="debug_openalex", pdf_urls=None):
+        """
+        Pipeline locations → plugins → landing → meta → enlaces directos → view
 
-        except Exception as e:
-            return False, None, None
+        Args:
+            pdf_urls: URLs de PDF que OpenAlex ya conoce para la obra (ver
+                      _location_pdf_urls); se prueban antes de ir a doi.org
 
-    def _resolve_pdf_with_logs(self, doi, debug=True, debug_dir="debug_openalex"):
+        Returns:
+            (pdf_url, method, referer, flow_log, pdf) — `pdf` es la respuesta
+            ya abierta del candidato validado (o None), lista para escribirse
+        """
         log = {"doi": doi, "steps": []}
         doi_norm = (doi or "").replace("https://doi.org/", "").replace("http://doi.org/", "").strip()
         doi_safe = _sanitize_doi_for_filename(doi)
@@ -564,15 +1681,33 @@ class OpenAlexSearcher:
         def _log(step):
             log["steps"].append(step)
 
+        # Primero los PDFs de las locations de OpenAlex, en carrera escalonada
+        tried = set()
+        if pdf_urls:
+            cand, fin, pdf = self._race_candidates(self._location_candidates(pdf_urls, log, tried), log, "location")
+            if cand:
+                return fin, cand["method"], cand["referer"], log, pdf
+
+        # Estrategia 0a: plugins por prefijo de DOI, sin pasar por doi.org
+        matches = doi_candidates(doi_norm)
+        if matches:
+            cand, fin, pdf = self._race_candidates(self._plugin_candidates(matches, None, log, tried), log, "plugin")
+            self._record_plugins(matches, cand, log)
+            if cand:
+                return fin, cand["method"], cand["referer"], log, pdf
+
+        # La landing se abre en streaming: si un plugin resuelve con la URL
+        # final, el HTML no llega a descargarse
         try:
-            landing = self.session.get(f"https://doi.org/{doi_norm}", timeout=self.timeout, allow_redirects=True)
+            landing = self._polite("get", f"https://doi.org/{doi_norm}", timeout=self.timeout, allow_redirects=True, stream=True)
             _log({"phase":"landing", "request": f"https://doi.org/{doi_norm}", "status": landing.status_code, "final_url": landing.url})
         except Exception as e:
             _log({"phase":"landing", "error": str(e)})
-            return None, None, None, log
+            return None, None, None, log, None
 
         if not landing.ok:
-            return None, None, None, log
+            landing.close()
+            return None, None, None, log, None
         base = landing.url
 
         # Detectar si Crossref redirect a su API (devuelve JSON en lugar de HTML)
@@ -585,19 +1720,35 @@ class OpenAlexSearcher:
                     _log({"phase":"crossref_primary_url", "url": primary_url})
                     # Hacer nueva petición a la URL real del artículo
                     try:
-                        landing = self.session.get(primary_url, timeout=self.timeout, allow_redirects=True)
+                        landing = self._polite("get", primary_url, timeout=self.timeout, allow_redirects=True, stream=True)
                         base = landing.url
                         _log({"phase":"article_page", "status": landing.status_code, "url": landing.url})
                         if not landing.ok:
-                            return None, None, None, log
+                            landing.close()
+                            return None, None, None, log, None
                     except Exception as e:
                         _log({"phase":"article_page_error", "error": str(e)})
-                        return None, None, None, log
+                        return None, None, None, log, None
             except Exception as e:
                 _log({"phase":"crossref_json_parse_error", "error": str(e)})
                 # Intentar continuar con el HTML aunque sea Crossref
                 pass
 
+        # Estrategia 0b: plugins por host de la landing (OJS, SciELO, Redalyc, PMC...)
+        matches = landing_candidates(base)
+        if matches:
+            cand, fin, pdf = self._race_candidates(self._plugin_candidates(matches, base, log, tried), log, "plugin")
+            self._record_plugins(matches, cand, log)
+            if cand:
+                landing.close()
+                return fin, cand["method"], cand["referer"], log, pdf
+
+        try:
+            landing.content
+        except Exception as e:
+            _log({"phase":"landing_read", "error": str(e)})
+            return None, None, None, log, None
+
         if debug and debug_dir:
             try:
                 os.makedirs(debug_dir, exist_ok=True)
@@ -606,47 +1757,26 @@ class OpenAlexSearcher:
             except Exception as e:
                 _log({"phase":"debug_save_landing", "error": str(e)})
 
-        # Estrategia 1: Buscar meta tags PDF
-        meta_pdf = self._find_meta_pdf_url(landing.content, base)
-        _log({"phase":"meta_lookup", "meta_pdf": meta_pdf or ""})
-        if meta_pdf:
-            ok, fin, r = self._try_get_pdf(meta_pdf, referer=base, stream=False)
-            _log({"phase":"meta_try", "url": meta_pdf, "ok": bool(ok), "final_url": fin or ""})
-            if ok:
-                return fin, "meta_pdf", base, log
-
-        # Estrategia 2: Buscar enlaces directos a PDF en la página landing
-        direct_links = self._find_direct_pdf_links(landing.content, base)
-        _log({"phase":"direct_links_lookup", "count": len(direct_links), "links": direct_links})
-        for dlink in direct_links:
-            # Patrón OJS: convertir /article/view/ID/GALLEY a /article/download/ID/GALLEY
-            test_url = dlink
-            if "/article/view/" in dlink.lower():
-                test_url_download = dlink.replace("/article/view/", "/article/download/").replace("/Article/View/", "/Article/Download/")
-                _log({"phase":"ojs_view_to_download", "original": dlink, "converted": test_url_download})
-                # Probar primero la versión download
-                ok, fin, r = self._try_get_pdf(test_url_download, referer=base, stream=False)
-                _log({"phase":"direct_link_try", "url": test_url_download, "ok": bool(ok), "final_url": fin or ""})
-                if ok:
-                    return fin, "direct_link_ojs", base, log
-                # Si falla, probar la URL original view
-                test_url = dlink
+        # Un único análisis de la landing alimenta las tres estrategias
+        page = self._analyze_landing(landing.content, base)
 
-            ok, fin, r = self._try_get_pdf(test_url, referer=base, stream=False)
-            _log({"phase":"direct_link_try", "url": test_url, "ok": bool(ok), "final_url": fin or ""})
-            if ok:
-                return fin, "direct_link", base, log
+        # Estrategias 1 y 2: meta tags PDF y enlaces directos, sondeados en
+        # paralelo escalonado en ese orden de prioridad
+        candidates = [c for c in self._landing_candidates(page, base, log) if c["url"] not in tried]
+        cand, fin, pdf = self._race_candidates(candidates, log, "landing")
+        if cand:
+            return fin, cand["method"], cand["referer"], log, pdf
 
         # Estrategia 3: Pipeline view → download
-        view_url = self._find_view_link(landing.content, base)
+        view_url = page["view_url"]
         _log({"phase":"view_lookup", "view_url": view_url or ""})
         if view_url:
             try:
-                view = self.session.get(view_url, timeout=self.timeout, allow_redirects=True, headers={"Referer": base})
+                view = self._polite("get", view_url, timeout=self.timeout, allow_redirects=True, headers={"Referer": base})
                 _log({"phase":"view_request", "status": view.status_code, "final_url": view.url})
             except Exception as e:
                 _log({"phase":"view_request", "error": str(e)})
-                return None, None, None, log
+                return None, None, None, log, None
 
             if view.ok:
                 if debug and debug_dir:
@@ -657,15 +1787,210 @@ class OpenAlexSearcher:
                         _log({"phase":"debug_save_view", "error": str(e)})
                 dlinks = self._extract_download_links_from_view(view.content, view.url)
                 _log({"phase":"download_links", "count": len(dlinks), "links": dlinks})
-                for durl in dlinks:
-                    ok, fin, r = self._try_get_pdf(durl, referer=view.url, stream=False)
-                    _log({"phase":"download_try", "url": durl, "ok": bool(ok), "final_url": fin or ""})
-                    if ok:
-                        return fin, "view_download", view.url, log
+                candidates = [
+                    {"url": durl, "method": "view_download", "referer": view.url, "phase": "download_try"}
+                    for durl in dlinks
+                ]
+                cand, fin, pdf = self._race_candidates(candidates, log, "view")
+                if cand:
+                    return fin, "view_download", view.url, log, pdf
+
+        return None, None, None, log, None
+
+    def _output_filename(self, idx, doi, metadata, response):
+        """
+        Nombre de archivo para un DOI: metadatos, Content-Disposition o DOI sanitizado
+
+        Sin metadatos el nombre lleva delante el índice (`007-...`, como los
+        descriptivos): dos DOIs con el mismo Content-Disposition no pueden
+        escribir el mismo archivo a la vez.
+        """
+        name = None
+
+        # Opción 1: Usar metadatos si están disponibles (preferido)
+        if metadata and doi in metadata:
+            meta = metadata[doi]
+            name = _generate_descriptive_filename(
+                index=meta.get('index', idx),
+                title=meta.get('title', ''),
+                author=meta.get('author', ''),
+                doi=doi
+            )
+
+        # Opción 2: Parsear Content-Disposition del servidor
+        if not name:
+            disp = response.headers.get("Content-Disposition", "") if response else ""
+            if disp:
+                # Intentar extraer filename= o filename*=
+                import re
+                # Buscar filename*=UTF-8''nombre o filename="nombre" o filename=nombre
+                match = re.search(r"filename\*=UTF-8''([^;]+)", disp)
+                if match:
+                    name = match.group(1)
+                else:
+                    match = re.search(r'filename="?([^";]+)"?', disp)
+                    if match:
+                        name = match.group(1)
+
+        # Opción 3: Fallback al DOI sanitizado
+        if not name:
+            name = _sanitize_doi_for_filename(doi) + ".pdf"
+
+        # Sanitizar el nombre de archivo (por si viene del servidor)
+        if not metadata or doi not in metadata:
+            name = _sanitize_doi_for_filename(name) if not name.lower().endswith('.pdf') else name
+            if not name.lower().endswith('.pdf'):
+                name += '.pdf'
+            name = f"{idx:03d}-{name}"
 
-        return None, None, None, log
+        return name
 
-    def download_pdfs_from_dois(self, dois, output_dir, progress_callback=None, debug=True, debug_dir="debug_openalex", metadata=None):
+    def _resolve_cached(self, doi, debug=True, debug_dir="debug_openalex", pdf_urls=None):
+        """
+        Resuelve el PDF de un DOI consultando primero la caché de resoluciones
+
+        Una URL cacheada se valida abriéndola; si dejó de servir, se borra de
+        la caché y se resuelve de nuevo. Ante un "sin PDF" cacheado solo se
+        prueban las `pdf_urls` de OpenAlex, si vienen (pueden ser nuevas); el
+        resto del pipeline (doi.org, plugins, scraping) no se repite.
+
+        Returns:
+            (pdf_url, method, referer, flow_log, pdf, cache_state) donde `pdf`
+            es la respuesta PDF abierta (o None) y cache_state es "hit",
+            "miss" o None si no hay caché configurada
+        """
+        rc = self.resolution_cache
+        if rc is not None:
+            hit = rc.get(doi)
+            if hit is not None:
+                step = {"phase": "resolution_cache", "pdf_url": hit["pdf_url"] or "", "method": hit["method"] or ""}
+                log = {"doi": doi, "steps": [step]}
+                if not hit["pdf_url"]:
+                    cand, fin, pdf = None, None, None
+                    if pdf_urls:
+                        cand, fin, pdf = self._race_candidates(self._location_candidates(pdf_urls, log, set()), log, "location")
+                    if not cand:
+                        return None, None, None, log, None, "hit"
+                    rc.put(doi, fin, cand["method"], cand["referer"])
+                    return fin, cand["method"], cand["referer"], log, pdf, "miss"
+                ok, fin, pdf, _ = self._try_get_pdf(hit["pdf_url"], referer=hit["referer"])
+                if ok:
+                    return fin, hit["method"], hit["referer"], log, pdf, "hit"
+                # La URL cacheada dejó de servir: resolver de nuevo
+                rc.delete(doi)
+
+        pdf_url, method, referer, flow_log, pdf = self._resolve_pdf_with_logs(doi, debug=debug, debug_dir=debug_dir, pdf_urls=pdf_urls)
+        if rc is None:
+            return pdf_url, method, referer, flow_log, pdf, None
+        if pdf_url:
+            rc.put(doi, pdf_url, method, referer)
+        elif _is_definitive_miss(flow_log):
+            rc.put_negative(doi)
+        return pdf_url, method, referer, flow_log, pdf, "miss"
+
+    def _save_flow_log(self, doi, flow_log, debug, debug_dir, errors):
+        if debug and debug_dir:
+            try:
+                with open(os.path.join(debug_dir, f"{_sanitize_doi_for_filename(doi)}_log.json"), "w", encoding="utf-8") as fh:
+                    json.dump(flow_log, fh, ensure_ascii=False, indent=2)
+            except Exception as e:
+                errors.append(f"{doi}: error guardando log: {e}")
+
+    def _from_store(self, idx, doi, output_dir, metadata, errors):
+        """Entrada de log si el PDF ya está en el almacén local (sin tocar la red)"""
+        if self.pdf_store is None:
+            return None
+        fpath = os.path.join(output_dir, self._output_filename(idx, doi, metadata, None))
+        try:
+            if self.pdf_store.materialize(doi, fpath):
+                return {"doi": doi, "status": "downloaded", "method": "store", "file_path": fpath, "store": "hit"}
+        except Exception as e:
+            errors.append(f"{doi}: error leyendo almacén de PDFs: {e}")
+        return None
+
+    def _to_store(self, doi, fpath, errors):
+        if self.pdf_store is None:
+            return
+        try:
+            self.pdf_store.put(doi, fpath)
+        except Exception as e:
+            errors.append(f"{doi}: error guardando en almacén de PDFs: {e}")
+
+    def _download_one(self, idx, doi, output_dir, debug=True, debug_dir="debug_openalex", metadata=None, archive=None, pdf_urls=None, job=None):
+        """
+        Resuelve y descarga el PDF de un único DOI (pdf_urls: ver
+        _resolve_pdf_with_logs; job: DownloadJob donde anotar la resolución)
+
+        Returns:
+            (entry, errors): entrada para stats["log"] y lista de mensajes de error
+        """
+        errors = []
+        stored = self._from_store(idx, doi, output_dir, metadata, errors)
+        if stored:
+            if archive is not None:
+                archive.add_file(stored["file_path"], os.path.basename(stored["file_path"]))
+            return stored, errors
+
+        pdf_url, method, referer, flow_log, pdf, cache_state = self._resolve_cached(doi, debug=debug, debug_dir=debug_dir, pdf_urls=pdf_urls)
+        self._save_flow_log(doi, flow_log, debug, debug_dir, errors)
+
+        def _entry(**fields):
+            entry = {"doi": doi, **fields}
+            if cache_state:
+                entry["resolution_cache"] = cache_state
+            return entry
+
+        if not pdf_url:
+            return _no_pdf_entry(_entry, flow_log, cache_state), errors
+        if job is not None:
+            job.mark_resolved(doi, pdf_url, method)
+
+        try:
+            name = self._output_filename(idx, doi, metadata, pdf)
+            fpath = os.path.join(output_dir, name)
+            # El cuerpo también ocupa una conexión al dominio mientras se descarga
+            with self.scheduler.slot(pdf.url, consume_token=False):
+                with open(fpath, "wb") as f:
+                    for chunk in pdf.iter_content():
+                        if chunk:
+                            f.write(chunk)
+            if archive is not None:
+                # Relectura deliberada del archivo recién escrito (ver PdfArchive)
+                archive.add_file(fpath, name)
+            self._to_store(doi, fpath, errors)
+            return _entry(status="downloaded", url=pdf_url, method=method, file_path=fpath), errors
+        except Exception as e:
+            errors.append(f"{doi}: {e}")
+            return _entry(status="error", error=str(e)), errors
+        finally:
+            pdf.close()
+
+    def _replay_job(self, job, jobs, pdf_urls, stats, archive):
+        """
+        Vuelca en `stats` los DOIs que el diario ya dio por terminados
+
+        Returns:
+            (jobs pendientes, pdf_urls con las URLs ya resueltas adelante)
+        """
+        finished, known = job.replay()
+        pending = []
+        for idx, doi in jobs:
+            entry = finished.get(_normalize_doi(doi))
+            if entry is None:
+                pending.append((idx, doi))
+                continue
+            entry = dict(entry, doi=doi)
+            if archive is not None and entry["status"] == "downloaded":
+                archive.add_file(entry["file_path"], os.path.basename(entry["file_path"]))
+            _record_download_outcome(stats, entry, [])
+        hints = dict(pdf_urls)
+        for _, doi in pending:
+            url = known.get(_normalize_doi(doi))
+            if url:
+                hints[doi] = [url] + [u for u in hints.get(doi, []) if u != url]
+        return pending, hints
+
+    def download_pdfs_from_dois(self, dois, output_dir, progress_callback=None, debug=True, debug_dir="debug_openalex", metadata=None, max_workers=1, archive=None, pdf_urls=None, job=None):
         """
         Descarga PDFs desde una lista de DOIs
 
@@ -677,91 +2002,92 @@ class OpenAlexSearcher:
             debug_dir: Directorio para logs de debug
             metadata: Diccionario opcional {doi: {'title': ..., 'author': ..., 'index': ...}}
                       Si se provee, usa nombres descriptivos: ID-autor-titulo.pdf
+            max_workers: Cantidad de DOIs procesados en paralelo (1 = secuencial).
+                         El progreso se reporta a medida que cada DOI termina.
+            archive: PdfArchive opcional; cada PDF se agrega al ZIP apenas termina
+            pdf_urls: Diccionario opcional {doi: [urls]} con los PDFs que OpenAlex
+                      ya conoce; se prueban antes de la landing (ver download_pdfs_from_rows)
+            job: DownloadJob opcional (ver openalex_jobs.py): los DOIs que ya
+                 terminaron en una corrida anterior no se vuelven a procesar y
+                 cada resultado queda anotado en el diario
 
         Returns:
             Diccionario con estadísticas de descarga
         """
         os.makedirs(output_dir, exist_ok=True)
+        pdf_urls = pdf_urls or {}
         if debug and debug_dir:
             os.makedirs(debug_dir, exist_ok=True)
 
-        stats = {"total": len(dois), "downloaded": 0, "failed": 0, "no_pdf": 0, "log": [], "errors": []}
+        stats = _new_download_stats(len(dois))
 
-        for idx, doi in enumerate(dois, start=1):
-            doi_safe = _sanitize_doi_for_filename(doi)
-            pdf_url, method, referer, flow_log = self._resolve_pdf_with_logs(doi, debug=debug, debug_dir=debug_dir)
+        def _record(entry, errors):
+            _record_download_outcome(stats, entry, errors)
+            if job is not None:
+                job.record(entry)
 
-            if debug and debug_dir:
+        jobs = list(enumerate(dois, start=1))
+        if job is not None:
+            jobs, pdf_urls = self._replay_job(job, jobs, pdf_urls, stats, archive)
+        done = len(dois) - len(jobs)
+        if max_workers > 1:
+            # Alternar editoriales para no saturar un mismo dominio
+            jobs = _interleave_by_prefix(jobs)
+
+        if max_workers <= 1:
+            for idx, doi in jobs:
                 try:
-                    with open(os.path.join(debug_dir, f"{doi_safe}_log.json"), "w", encoding="utf-8") as fh:
-                        json.dump(flow_log, fh, ensure_ascii=False, indent=2)
+                    _record(*self._download_one(idx, doi, output_dir, debug, debug_dir, metadata, archive, pdf_urls.get(doi), job))
                 except Exception as e:
-                    stats["errors"].append(f"{doi}: error guardando log: {e}")
-
-            try:
-                if pdf_url:
-                    ok, fin, r = self._try_get_pdf(pdf_url, referer=referer, stream=True)
-                    if ok:
-                        if r is None:
-                            r = self.session.get(fin, timeout=self.timeout, headers=({"Referer": referer} if referer else None), stream=True)
-
-                        # Generar nombre de archivo
-                        name = None
-
-                        # Opción 1: Usar metadatos si están disponibles (preferido)
-                        if metadata and doi in metadata:
-                            meta = metadata[doi]
-                            name = _generate_descriptive_filename(
-                                index=meta.get('index', idx),
-                                title=meta.get('title', ''),
-                                author=meta.get('author', ''),
-                                doi=doi
-                            )
-
-                        # Opción 2: Parsear Content-Disposition del servidor
-                        if not name:
-                            disp = r.headers.get("Content-Disposition", "") if r else ""
-                            if disp:
-                                # Intentar extraer filename= o filename*=
-                                import re
-                                # Buscar filename*=UTF-8''nombre o filename="nombre" o filename=nombre
-                                match = re.search(r"filename\*=UTF-8''([^;]+)", disp)
-                                if match:
-                                    name = match.group(1)
-                                else:
-                                    match = re.search(r'filename="?([^";]+)"?', disp)
-                                    if match:
-                                        name = match.group(1)
-
-                        # Opción 3: Fallback al DOI sanitizado
-                        if not name:
-                            name = doi_safe + ".pdf"
-
-                        # Sanitizar el nombre de archivo (por si viene del servidor)
-                        if not metadata or doi not in metadata:
-                            name = _sanitize_doi_for_filename(name) if not name.lower().endswith('.pdf') else name
-                            if not name.lower().endswith('.pdf'):
-                                name += '.pdf'
-
-                        fpath = os.path.join(output_dir, name)
-                        with open(fpath, "wb") as f:
-                            for chunk in r.iter_content(chunk_size=65536):
-                                if chunk:
-                                    f.write(chunk)
-                        stats["downloaded"] += 1
-                        stats["log"].append({"doi": doi, "status": "downloaded", "url": fin, "method": method, "file_path": fpath})
-                    else:
-                        stats["failed"] += 1
-                        stats["errors"].append(f"Descarga fallida desde {pdf_url}")
-                        stats["log"].append({"doi": doi, "status": "failed", "method": method})
-                else:
-                    stats["no_pdf"] += 1
-                    stats["log"].append({"doi": doi, "status": "no_pdf"})
-            except Exception as e:
-                stats["failed"] += 1
-                stats["errors"].append(f"{doi}: {e}")
-                stats["log"].append({"doi": doi, "status": "error", "error": str(e)})
-            finally:
-                _safe_progress(progress_callback, idx, len(dois), stats['downloaded'])
+                    _record({"doi": doi, "status": "error", "error": str(e)}, [f"{doi}: {e}"])
+                finally:
+                    done += 1
+                    _safe_progress(progress_callback, done, len(dois), stats['downloaded'])
+            return stats
+
+        # Modo concurrente: los workers solo hacen red/disco; stats y progreso
+        # se actualizan en este hilo a medida que cada DOI termina
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self._download_one, idx, doi, output_dir, debug, debug_dir, metadata, archive, pdf_urls.get(doi), job): doi
+                for idx, doi in jobs
+            }
+            for fut in as_completed(futures):
+                doi = futures[fut]
+                try:
+                    _record(*fut.result())
+                except Exception as e:
+                    _record({"doi": doi, "status": "error", "error": str(e)}, [f"{doi}: {e}"])
+                finally:
+                    done += 1
+                    _safe_progress(progress_callback, done, len(dois), stats['downloaded'])
 
         return stats
+
+    def download_pdfs_from_rows(self, rows, output_dir, metadata=None, **kwargs):
+        """
+        Descarga PDFs desde filas de resultados (get_all_results, get_works_by_dois...)
+
+        Además del DOI se aprovechan las URLs de PDF de la fila (`pdf_urls`,
+        de las `locations` de OpenAlex, o `oa_pdf_url`): se prueban primero y
+        la landing solo se visita si ninguna sirve. Las filas sin DOI se omiten.
+
+        Args:
+            rows: Lista de filas (dicts con el formato de _extract_row)
+            output_dir: Directorio donde guardar los PDFs
+            metadata: Como en download_pdfs_from_dois; por defecto se arma con
+                      título, autor y posición de cada fila
+            **kwargs: Resto de argumentos de download_pdfs_from_dois
+
+        Returns:
+            Lo mismo que download_pdfs_from_dois
+        """
+        dois, hints, meta = [], {}, {}
+        for pos, row in enumerate(rows, start=1):
+            doi = row.get("doi")
+            if not isinstance(doi, str) or not doi or doi in hints:
+                continue
+            dois.append(doi)
+            hints[doi] = _row_pdf_urls(row)
+            meta[doi] = {"index": pos, "title": row.get("title", ""), "author": row.get("author", "")}
+        return self.download_pdfs_from_dois(dois, output_dir, metadata=metadata if metadata is not None else meta, pdf_urls=hints, **kwargs)